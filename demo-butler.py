@@ -3,7 +3,7 @@
 #!/usr/bin/env python3
 
 import os
-import shutil
+import re
 import json
 import time
 import threading
@@ -13,6 +13,7 @@ import spacy
 import subprocess
 import sys
 import parsedatetime as pdt
+from utils.fileops import FileIndex, move_files
 
 cal = pdt.Calendar()
 
@@ -28,6 +29,9 @@ INTENT_KEYWORDS = {
 
 REMINDER_FILE = "memory/reminders.json"
 
+# Built in the background at startup; refresh() afterwards only rescans changed dirs
+file_index = FileIndex()
+
 
 def speak(text):
     subprocess.run(["python3", "scripts/say.py", text])
@@ -106,19 +110,66 @@ def handle_reminder(text):
     save_reminder(task, when_str)
 
 
+def _report_move(job):
+    if job.error:
+        speak(f"Could not move {os.path.basename(job.src)}: {job.error}")
+    else:
+        speak(f"Finished moving {os.path.basename(job.src)}")
+
+
+def _report_progress(job):
+    print(f"\r[MOVE] {os.path.basename(job.src)} {job.progress:.0%}", end="", flush=True)
+
+
+def _confirm_file(name, candidates, exact):
+    """Return the file to move; anything but a single exact match is asked about."""
+    if exact and len(candidates) == 1:
+        return candidates[0]
+    if exact:
+        speak(f"I found several files called {name}. Which one?")
+    else:
+        speak(f"I couldn't find {name} exactly. Did you mean one of these?")
+    for i, path in enumerate(candidates, 1):
+        print(f"  {i}. {path}")
+    answer = input("Number to move, or Enter to skip: ").strip()
+    if answer.isdigit() and 1 <= int(answer) <= len(candidates):
+        return candidates[int(answer) - 1]
+    speak(f"Skipping {name}.")
+    return None
+
+
 def handle_move_file(text):
-    # naive example: "move file.txt to archive"
-    tokens = text.split()
-    try:
-        src = next(tok for tok in tokens if os.path.isfile(tok))
-        dest_index = tokens.index("to") + 1
-        dest = tokens[dest_index]
-        if not os.path.exists(dest):
-            os.makedirs(dest)
-        shutil.move(src, dest)
-        speak(f"Moved {src} to {dest}")
-    except Exception as e:
-        speak(f"Could not complete file move: {str(e)}")
+    # e.g. "move report.pdf and notes.txt to archive"
+    match = re.search(r"\b(?:move|relocate|archive)\s+(.+?)\s+to\s+(.+)$", text, re.IGNORECASE)
+    if not match:
+        speak("Please say something like: move report.pdf to archive.")
+        return
+    names = [n.strip(" ,") for n in re.split(r",|\band\b", match.group(1)) if n.strip(" ,")]
+    names = [re.sub(r"^(?:the\s+)?(?:files?\s+)?", "", n, flags=re.IGNORECASE) for n in names]
+    dest = os.path.expanduser(match.group(2).strip())
+
+    file_index.refresh()
+    sources, missing = [], []
+    for name in names:
+        candidates, exact = file_index.resolve(name)
+        if not candidates:
+            missing.append(name)
+            continue
+        source = _confirm_file(name, candidates, exact)
+        if source:
+            sources.append(source)
+    for name in missing:
+        speak(f"I couldn't find a file called {name}.")
+    if not sources:
+        return
+
+    moved, jobs, failed = move_files(sources, dest, on_progress=_report_progress, on_done=_report_move)
+    if moved:
+        speak(f"Moved {', '.join(os.path.basename(p) for p in moved)} to {dest}")
+    if jobs:
+        speak(f"Copying {len(jobs)} file{'s' if len(jobs) > 1 else ''} to {dest} in the background.")
+    for src, err in failed.items():
+        speak(f"Could not move {os.path.basename(src)}: {err}")
 
 
 def handle_list_reminders():
@@ -138,6 +189,7 @@ def handle_list_reminders():
 
 def main():
     threading.Thread(target=check_reminders_loop, daemon=True).start()
+    threading.Thread(target=file_index.refresh, daemon=True).start()
     speak("Butler ready. How can I help?")
     while True:
         try:
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# loadtest.py
+#
+# Drives server.py with many concurrent WebSocket clients against a fake
+# Ollama, so throughput and queuing can be measured without a real model:
+#
+#   python3 loadtest.py --clients 40 --turns 5
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from aiohttp import web, ClientSession, WSMsgType
+
+FAKE_TOKENS = 40          # tokens per fake response
+FAKE_TOKEN_DELAY = 0.01   # seconds between fake tokens (~100 tok/s)
+READY_TIMEOUT = 60.0      # seconds to wait for server.py to start
+PROMPTS = [
+    "Tell me something interesting about owls.",
+    "How should I plan a quiet evening?",
+    "Give me a short motivational thought.",
+]
+
+
+async def fake_generate(request):
+    body = await request.json()
+    context = body.get("context") or []
+    resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await resp.prepare(request)
+    for i in range(FAKE_TOKENS):
+        await asyncio.sleep(FAKE_TOKEN_DELAY)
+        await resp.write((json.dumps({"response": f"tok{i} ", "done": False}) + "\n").encode())
+    final = {
+        "response": "", "done": True,
+        "context": context + list(range(len(body["prompt"].split()) + FAKE_TOKENS)),
+        "prompt_eval_count": len(body["prompt"].split()), "eval_count": FAKE_TOKENS,
+    }
+    await resp.write((json.dumps(final) + "\n").encode())
+    await resp.write_eof()
+    return resp
+
+
+async def start_fake_llm(port):
+    app = web.Application()
+    app.add_routes([web.post("/api/generate", fake_generate)])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def client(http, url, turns, latencies, counters):
+    async with http.ws_connect(url) as ws:
+        await ws.receive_json()  # session greeting
+        for t in range(turns):
+            while True:
+                start = time.perf_counter()
+                await ws.send_json({"text": PROMPTS[t % len(PROMPTS)]})
+                first_token = None
+                async for msg in ws:
+                    if msg.type != WSMsgType.TEXT:
+                        continue
+                    data = json.loads(msg.data)
+                    if data["type"] == "token" and first_token is None:
+                        first_token = time.perf_counter() - start
+                    if data["type"] in ("result", "busy", "error"):
+                        break
+                if data["type"] == "busy":
+                    counters["busy"] += 1
+                    await asyncio.sleep(data.get("retry_after", 1))
+                    continue
+                if data["type"] == "error":
+                    counters["errors"] += 1
+                else:
+                    latencies.append((time.perf_counter() - start, first_token or 0.0))
+                break
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else 0.0
+
+
+async def run(args):
+    fake = await start_fake_llm(args.llm_port)
+    env = dict(os.environ, OLLAMA_URL=f"http://127.0.0.1:{args.llm_port}")
+    server = subprocess.Popen(
+        [sys.executable, "server.py", "--port", str(args.port),
+         "--llm-concurrency", str(args.llm_concurrency), "--queue-limit", str(args.queue_limit)],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        async with ClientSession() as http:
+            # Wait for the server (spaCy load takes a few seconds)
+            for _ in range(int(READY_TIMEOUT / 0.5)):
+                if server.poll() is not None:
+                    raise SystemExit(f"server.py exited with code {server.returncode} before it was ready")
+                try:
+                    async with http.post(f"http://127.0.0.1:{args.port}/sessions") as resp:
+                        if resp.status == 200:
+                            break
+                except OSError:
+                    pass
+                await asyncio.sleep(0.5)
+            else:
+                raise SystemExit(f"server.py did not come up on port {args.port} within {READY_TIMEOUT:.0f}s")
+
+            latencies, counters = [], {"busy": 0, "errors": 0}
+            url = f"ws://127.0.0.1:{args.port}/ws"
+            start = time.perf_counter()
+            await asyncio.gather(*(
+                client(http, f"{url}?session=load{i}", args.turns, latencies, counters)
+                for i in range(args.clients)
+            ))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+        await fake.cleanup()
+
+    totals = [t for t, _ in latencies]
+    firsts = [f for _, f in latencies]
+    print(f"Clients: {args.clients}  turns/client: {args.turns}  LLM slots: {args.llm_concurrency}")
+    print(f"Completed turns: {len(latencies)} in {elapsed:.2f}s  ({len(latencies) / elapsed:.1f} turns/s)")
+    print(f"Turn latency   p50 {pct(totals, 0.5):.0f} ms   p95 {pct(totals, 0.95):.0f} ms")
+    print(f"First token    p50 {pct(firsts, 0.5):.0f} ms   p95 {pct(firsts, 0.95):.0f} ms")
+    print(f"Busy rejections: {counters['busy']}   errors: {counters['errors']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for server.py using a fake LLM")
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--llm-port", type=int, default=11499)
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--queue-limit", type=int, default=64)
+    asyncio.run(run(parser.parse_args()))
@@ -1,73 +1,62 @@
 import argparse
-import json
+import asyncio
 import re
 import subprocess
 import sys
 import threading
 import time
-import requests
 from datetime import datetime
 from dateutil import parser as dtparser
+from dateparser import parse as parse_date
 import logging
-from rich.logging import RichHandler
 from rich.console import Console
 
 from memory.mnemosyne import MemoryManager
-from memory.reminders import ReminderManager
+from memory.reminders import ReminderManager, find_time, parse_recurrence
+from memory.weather import WeatherService, describe as describe_weather
 from nlu import extract_intent_entities
+from utils.llm_session import OllamaSession
+from utils.logger import setup_logging
+from utils.tts_cache import speak_cached
 
 # === Logging & Console ===
 console = Console()
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(console=console)]
-)
+setup_logging(console=console)
 log = logging.getLogger("ethos")
 
 # === Managers ===
 memory = MemoryManager("memory/memory_store.json")
 reminder_manager = ReminderManager()
+chat_session = OllamaSession()
+weather_service = WeatherService()
 
 
 def speak(text):
+    if speak_cached(text):
+        return
     subprocess.run(["python3", "scripts/say.py", text], stderr=subprocess.DEVNULL)
 
 
-def ask_ollama(prompt, max_tokens=200, temperature=1.0, stream=True) -> str:
+def ask_ollama(prompt, max_tokens=200, temperature=1.0, stream=True, session=None) -> str:
+    # Without a session the call is stateless (no system prompt, no carried context)
+    session = session or OllamaSession(system=None)
     try:
         response = ""
+        sys.stdout.write("Thinking... ")
+        sys.stdout.flush()
         first_token = True
-        token_count = 0
-
-        url = "http://localhost:11434/api/generate"
-        data = {
-            "model": "qwen2.5:1.5b-instruct",
-            "prompt": prompt.strip(),
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "stream": stream,
-        }
-
-        with requests.post(url, json=data, stream=stream) as r:
-            for line in r.iter_lines():
-                if line:
-                    json_response = json.loads(line)
-                    token = json_response.get("response", "")
-                    if token:
-                        if first_token:
-                            sys.stdout.write("\r" + " " * 50 + "\r")
-                            first_token = False
-                        print(token, end="", flush=True)
-                        response += token
-                        token_count += 1
-                        if token_count >= max_tokens:
-                            break
-                    elif first_token:
-                        sys.stdout.write("\r" + " " * 50 + "\r")
-                        sys.stdout.write("Thinking... " + "|/-\\"[int(time.time() * 4) % 4])
-                        sys.stdout.flush()
+
+        for token in session.stream(prompt, max_tokens=max_tokens, temperature=temperature):
+            if first_token:
+                sys.stdout.write("\r" + " " * 50 + "\r")
+                first_token = False
+            if stream:
+                print(token, end="", flush=True)
+            response += token
+
+        if first_token:
+            sys.stdout.write("\r" + " " * 50 + "\r")
+        log.debug("LLM stats: %s", session.last_stats)
         return response or "[Sorry sir, I don't have a response]"
     except Exception:
         log.exception("Error in ask_ollama()")
@@ -75,7 +64,7 @@ def ask_ollama(prompt, max_tokens=200, temperature=1.0, stream=True) -> str:
 
 
 def trigger_action(task, time_str):
-    log.info(f"🔔 Reminder triggered: {task} @ {time_str}")
+    log.info("🔔 Reminder triggered: %s @ %s", task, time_str)
     speak(f"Reminder: {task}")
 
 
@@ -114,30 +103,51 @@ def extract_tag(text: str):
 
 # === Dispatcher Functions ===
 
-def handle_reminder(nlu_result, args):
-    task, tag = extract_tag(nlu_result["task"])
-    log.debug(f"Attempting to schedule: {task} @ {nlu_result['time']}")
+def reminder_time_prompt(task):
+    return f"Extract just the reminder time (like '6pm', 'tomorrow at noon') from: '{task}'"
 
-    parsed_dt = parse_date(nlu_result["time"], settings={'PREFER_DATES_FROM': 'future'}) if nlu_result["time"] else None
 
+def time_from_llm(llm_response):
+    """Pull a probable time string out of the LLM fallback reply, or None."""
+    log.debug("[LLM fallback] Raw: %s", llm_response)
+    match = re.search(r'([0-9]{1,2}\s*(am|pm)|tonight|this evening|tomorrow|next week|in \d+ (minutes|hours|days))', llm_response, re.IGNORECASE)
+    if not match:
+        log.warning("❌ Could not extract a valid time from LLM fallback response.")
+        return None
+    log.debug("[LLM fallback] Extracted time string: %s", match.group(0))
+    return match.group(0)
+
+
+def handle_reminder(nlu_result, args):
+    task, tag = extract_tag(nlu_result["task"])
+    try:
+        recur, task = parse_recurrence(task)
+    except ValueError as e:
+        log.info("❌ %s", e)
+        if not args.silent:
+            speak("❌ Failed to schedule reminder.")
+        return
+    log.debug("Attempting to schedule: %s @ %s", task, nlu_result['time'])
+
+    # The NLU time was parsed from the whole sentence, recurrence phrase included,
+    # so for recurring reminders look for the time in what's left instead
+    parsed_dt = None
+    if nlu_result["time"] and not recur:
+        parsed_dt = parse_date(nlu_result["time"], settings={'PREFER_DATES_FROM': 'future'})
     if not parsed_dt:
+        parsed_dt = find_time(task)
+
+    # The API server runs this fallback itself, behind its LLM gate
+    if not parsed_dt and getattr(args, "llm_fallback", True):
         log.info("[🤖 Fallback] Asking LLM to extract time...")
-        prompt = f"Extract just the reminder time (like '6pm', 'tomorrow at noon') from: '{nlu_result['task']}'"
-        llm_response = ask_ollama(prompt, max_tokens=50).strip()
-        log.debug(f"[LLM fallback] Raw: {llm_response}")
-
-        # Extract probable time string using regex or strip quotes/markdown
-        match = re.search(r'([0-9]{1,2}\s*(am|pm)|tonight|this evening|tomorrow|next week|in \d+ (minutes|hours|days))', llm_response, re.IGNORECASE)
-        if match:
-            extracted_time = match.group(0)
-            log.debug(f"[LLM fallback] Extracted time string: {extracted_time}")
+        extracted_time = time_from_llm(ask_ollama(reminder_time_prompt(nlu_result["task"]), max_tokens=50).strip())
+        if extracted_time:
             parsed_dt = parse_date(extracted_time, settings={'PREFER_DATES_FROM': 'future'})
-        else:
-            log.warning("❌ Could not extract a valid time from LLM fallback response.")
 
     if parsed_dt:
-        success = reminder_manager.add_reminder(task=task, when=parsed_dt.isoformat(), tag=tag)
-        msg = f"✅ Reminder saved: '{task}' at '{parsed_dt.strftime('%A %I:%M %p')}'" if success else "❌ Failed to schedule reminder."
+        success = reminder_manager.add_reminder(task=task, when=parsed_dt.isoformat(), tag=tag, recur=recur)
+        repeat = f" (repeats {recur['freq']})" if recur else ""
+        msg = f"✅ Reminder saved: '{task}' at '{parsed_dt.strftime('%A %I:%M %p')}'{repeat}" if success else "❌ Failed to schedule reminder."
     else:
         msg = "❌ Still could not extract a valid time."
 
@@ -147,7 +157,8 @@ def handle_reminder(nlu_result, args):
 
 
 def handle_query_reminders(nlu_result, args=None):
-    handle_list_reminders(args=args) 
+    # "Any reminders tomorrow?" asks about a window, not the whole store
+    handle_reminder_window(nlu_result["task"], args=args)
 
 
 def handle_list_reminders(*_, args=None):
@@ -165,6 +176,31 @@ def handle_list_reminders(*_, args=None):
             speak(f"You have {len(reminders)} reminders.")
 
 
+def handle_reminder_window(user_input, *_, args=None):
+    text = user_input.lower()
+    next_n = re.search(r"next (\d+)", text)
+    if next_n:
+        title, occurrences = "Coming Up", reminder_manager.upcoming(int(next_n.group(1)))
+    elif "tomorrow" in text:
+        title, occurrences = "Tomorrow", reminder_manager.day(1)
+    elif "today" in text:
+        title, occurrences = "Today", reminder_manager.day(0)
+    else:
+        title, occurrences = "This Week", reminder_manager.this_week()
+
+    if not occurrences:
+        console.print(f"[yellow]📭 Nothing scheduled ({title.lower()}).[/]")
+        if not args.silent:
+            speak(f"You have nothing scheduled {title.lower()}.")
+        return
+    console.print(f"[bold cyan]📅 {title}:[/]")
+    for when, r in occurrences:
+        repeat = " 🔁" if r.get("recur") else ""
+        console.print(f"  • {when.strftime('%a %d %b %I:%M %p')} — {r['task']}{repeat}")
+    if not args.silent:
+        speak(f"You have {len(occurrences)} reminders {title.lower()}.")
+
+
 def handle_delete_reminder(user_input, *_, args=None):
     match = re.search(r"delete reminder (\d+)", user_input.lower())
     if match:
@@ -180,15 +216,26 @@ def handle_delete_reminder(user_input, *_, args=None):
 
 
 def handle_agenda(*_, args=None):
-    subprocess.Popen(["python3", "memory/agenda.py"], stdout=subprocess.DEVNULL)
+    subprocess.Popen(["python3", "-m", "memory.agenda"], stdout=subprocess.DEVNULL)
     if not args.silent:
         speak("Here is your agenda.")
 
 
 def handle_weather(*_, args=None):
-    subprocess.run(["python3", "scripts/weather.py"])
+    try:
+        forecasts = asyncio.run(weather_service.forecasts())
+    except Exception:
+        log.exception("Weather lookup failed.")
+        forecasts = {}
+
+    if not forecasts:
+        msg = "❌ Weather is unavailable right now."
+        console.print(f"[red]{msg}[/]")
+    else:
+        msg = " ".join(describe_weather(name, values) for name, values in forecasts.items())
+        console.print(f"[bold cyan]🌦️ {msg}[/]")
     if not args.silent:
-        speak("Here is today’s weather forecast.")
+        speak(msg)
 
 
 def handle_help(*_, args=None):
@@ -197,7 +244,10 @@ def handle_help(*_, args=None):
         "• Remind me to call Sam at 6pm\n"
         "• What's my agenda today?\n"
         "• What's the weather like?\n"
+        "• Remind me to stretch every weekday at 10am\n"
         "• List reminders\n"
+        "• Reminders today / tomorrow / this week\n"
+        "• Next 3 reminders\n"
         "• Delete reminder 1\n"
         "• Exit"
     )
@@ -237,6 +287,11 @@ def main():
     parser.add_argument("--nlu-off", action="store_true", help="Disable natural language processing")
     args = parser.parse_args()
 
+    listener = None
+    if args.voice:
+        from utils.voice import VoiceListener
+        listener = VoiceListener()
+
     console.print("[bold magenta]🎙️ Ethos is listening...[/]")
 
     if not args.nlu_off:
@@ -245,9 +300,7 @@ def main():
     while True:
         try:
             if args.voice:
-                user_input = subprocess.check_output(["python3", "scripts/listen.py"]).decode().strip()
-                if "press ctrl+c to stop" in user_input.lower():
-                    continue
+                user_input = listener.listen().strip()
                 console.print(f"You said: [cyan]{user_input}[/]")
             else:
                 user_input = input("\n> ").strip()
@@ -257,14 +310,17 @@ def main():
 
             if not args.nlu_off:
                 nlu_result = extract_intent_entities(user_input)
-                log.debug(f"NLU: {nlu_result}")
+                log.debug("NLU: %s", nlu_result)
                 intent = nlu_result.get("intent")
                 if intent in dispatch:
                     dispatch[intent](nlu_result, args=args)
                     continue
 
             # Manual fallback for explicit commands
-            if user_input.lower().startswith("list reminders"):
+            if "reminder" in user_input.lower() and re.search(r"\b(today|tomorrow|this week|next \d+)\b", user_input.lower()):
+                handle_reminder_window(user_input, args=args)
+                continue
+            elif user_input.lower().startswith("list reminders"):
                 handle_list_reminders(args=args)
                 continue
             elif user_input.lower().startswith("delete reminder"):
@@ -277,7 +333,7 @@ def main():
             # Fallback to LLM
             console.print("\n[bold yellow]Ethos:[/]")
             print("\nEthos: ", end="", flush=True)
-            response = ask_ollama(user_input)
+            response = ask_ollama(user_input, session=chat_session)
 
             print()
             if not args.memory_off:
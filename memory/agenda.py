@@ -4,31 +4,35 @@
 
 import asyncio
 import subprocess
-import json
 import os
-import requests
+import time
 import feedparser
-from datetime import date, datetime
-from open_meteo import OpenMeteo
-from open_meteo.models import DailyParameters
-from babel.dates import format_date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from memory.reminders import ReminderManager
+from memory.weather import WeatherService, c_to_f
+from utils.fetch import fetcher, FetchError
+from utils.logger import setup_logging
+from utils.tts_cache import speak_cached
 
 # ✅ Config
-LAT, LON = 41.27, -72.97  # West Haven, CT
-REMINDER_FILE = "memory/reminders.json"
 NEWS_FEEDS = [
     "http://feeds.bbci.co.uk/news/rss.xml",
     "http://feeds.arstechnica.com/arstechnica/index",
     "https://www.theverge.com/rss/index.xml"
 ]
 BIBLE_API = "https://labs.bible.org/api/?passage=votd&type=json"
+# Hard ceiling (seconds) on all network work in one agenda run
+AGENDA_DEADLINE = float(os.environ.get("ETHOS_AGENDA_DEADLINE", "10"))
+
+reminder_manager = ReminderManager()
 
 # 📢 Use TTS
 def speak(text):
+    if speak_cached(text):
+        return
     subprocess.run(["python3", "scripts/say.py", text])
 
-def c_to_f(c): return round(c * 9 / 5 + 32, 1)
-
 def clothing_recommend(temp_f, rain_mm, wind_kph):
     if temp_f < 50:
         return "Wear a coat and scarf."
@@ -39,80 +43,96 @@ def clothing_recommend(temp_f, rain_mm, wind_kph):
     else:
         return "T-shirt and pants or a light dress should be fine."
 
-def fetch_news():
-    headlines = []
-    for feed_url in NEWS_FEEDS:
-        feed = feedparser.parse(feed_url)
-        headlines += [e.title for e in feed.entries[:2]]
+def _feed_headlines(feed_url, deadline):
+    try:
+        feed = feedparser.parse(fetcher.get(feed_url, deadline=deadline))
+    except FetchError:
+        return []
+    return [e.title for e in feed.entries[:2]]
+
+def fetch_news(deadline=None):
+    with ThreadPoolExecutor(max_workers=len(NEWS_FEEDS)) as pool:
+        per_feed = pool.map(lambda url: _feed_headlines(url, deadline), NEWS_FEEDS)
+        headlines = [h for feed in per_feed for h in feed]
     return headlines[:5]
 
-def fetch_bible_quote():
+def fetch_bible_quote(deadline=None):
     try:
-        resp = requests.get(BIBLE_API)
-        if resp.ok:
-            j = resp.json()[0]
-            return f"{j['verse']} — {j['text']}"
-    except:
+        j = fetcher.get_json(BIBLE_API, deadline=deadline)[0]
+        return f"{j['verse']} — {j['text']}"
+    except (FetchError, ValueError, KeyError, IndexError):
         pass
     return "Bible quote unavailable."
 
 def fetch_today_reminders():
-    if not os.path.exists(REMINDER_FILE):
-        return []
-    with open(REMINDER_FILE) as f:
-        try:
-            reminders = json.load(f)
-        except json.JSONDecodeError:
-            return []
+    # The butler owns the store; only re-read it when it has been saved since
+    reminder_manager.refresh()
+    return [r["task"] for _, r in reminder_manager.day(0)]
 
-    today_str = date.today().isoformat()
-    return [
-        r["task"]
-        for r in reminders
-        if not r.get("triggered") and r.get("time", "").startswith(today_str)
-    ]
+async def _bounded(task, deadline, fallback):
+    try:
+        return await asyncio.wait_for(task, max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError:
+        return fallback
+
+def fetch_weather(deadline):
+    async def bounded():
+        return await asyncio.wait_for(WeatherService().forecasts(),
+                                      max(0.0, deadline - time.monotonic()))
+    return asyncio.run(bounded())
 
 async def agenda_task():
+    deadline = time.monotonic() + AGENDA_DEADLINE
+
+    # Submit the outbound fetches to worker threads before the (blocking) greeting,
+    # so they really run while it is being spoken
+    pool = ThreadPoolExecutor(max_workers=3)
+    weather_job = asyncio.wrap_future(pool.submit(fetch_weather, deadline))
+    news_job = asyncio.wrap_future(pool.submit(fetch_news, deadline))
+    bible_job = asyncio.wrap_future(pool.submit(fetch_bible_quote, deadline))
+    try:
+        await _agenda_report(deadline, weather_job, news_job, bible_job)
+    finally:
+        # Never wait on a straggler past the deadline
+        pool.shutdown(wait=False, cancel_futures=True)
+        fetcher.log_stats()
+
+async def _agenda_report(deadline, weather_job, news_job, bible_job):
     speak("Good morning! Here is your agenda for today.")
     print("\n⏰ Good morning! Here's your agenda for today:\n")
 
     # ☁️ Weather
-    async with OpenMeteo() as om:
-        forecast = await om.forecast(
-            latitude=LAT,
-            longitude=LON,
-            daily=[
-                DailyParameters.TEMPERATURE_2M_MAX,
-                DailyParameters.PRECIPITATION_SUM,
-                DailyParameters.WIND_SPEED_10M_MAX,
-                DailyParameters.WEATHER_CODE,
-            ],
-            timezone="auto"
-        )
-        daily = forecast.daily
-
-        max_c = daily.temperature_2m_max[0]
-        rain_mm = daily.precipitation_sum[0]
-        wind_kph = daily.wind_speed_10m_max[0]
+    try:
+        forecasts = await asyncio.wait_for(weather_job, max(0.0, deadline - time.monotonic()))
+    except Exception:
+        forecasts = {}
+        print("🌡️ Weather unavailable.\n")
+    for name, values in forecasts.items():
+        max_c = values["temperature_2m_max"]
+        rain_mm = values["precipitation_sum"]
+        wind_kph = values["wind_speed_10m_max"]
         max_f = c_to_f(max_c)
 
+        if len(forecasts) > 1:
+            print(f"📍 {name.title()}")
         print(f"🌡️ High: {max_f}°F")
         print(f"🌧️ Rain: {rain_mm} mm")
         print(f"🌬️ Wind: {wind_kph} km/h")
         suggestion = clothing_recommend(max_f, rain_mm, wind_kph)
         print(f"🧥 Suggestion: {suggestion}\n")
 
-        speak(f"The high will be {max_f} degrees Fahrenheit. {suggestion}")
+        where = f" in {name}" if len(forecasts) > 1 else ""
+        speak(f"The high{where} will be {max_f} degrees Fahrenheit. {suggestion}")
 
     # 📰 News
     print("📰 Today's top news:")
-    headlines = fetch_news()
+    headlines = await _bounded(news_job, deadline, [])
     for headline in headlines:
         print(" •", headline)
     speak("Here are the top news headlines.")
 
     # ✝️ Bible Verse
-    bible = fetch_bible_quote()
+    bible = await _bounded(bible_job, deadline, "Bible quote unavailable.")
     print("\n📖 Bible Verse:")
     print(bible)
     speak("Here is your Bible verse of the day.")
@@ -154,6 +174,8 @@ async def agenda_loop():
 if __name__ == "__main__":
     import sys
 
+    setup_logging()
+
     if "--test" in sys.argv:
         print("🧪 Running agenda task once (test mode)...")
         try:
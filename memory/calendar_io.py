@@ -0,0 +1,351 @@
+# memory/calendar_io.py
+
+import csv
+import os
+import sys
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import dateparser
+from memory.reminders import RECUR_FREQS, first_occurrence, next_occurrence, upcoming_occurrence
+
+ICS_TIME = "%Y%m%dT%H%M%S"
+ICS_DATE = "%Y%m%d"
+RRULE_FREQS = {"HOURLY": "hourly", "DAILY": "daily", "WEEKLY": "weekly", "MONTHLY": "monthly"}
+WEEKDAYS = {"MO", "TU", "WE", "TH", "FR"}
+CSV_FIELDS = ["task", "time", "tag", "recur", "until", "interval"]
+
+
+# === Parsing ===
+
+def _unescape(value):
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _escape(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _unfolded(fp):
+    """Yield logical iCalendar lines, joining RFC 5545 continuation lines."""
+    current = None
+    for raw in fp:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+# RRULE parts the recurrence model has no way to express
+UNSUPPORTED_RRULE_PARTS = {"BYSETPOS", "BYMONTH", "BYYEARDAY", "BYWEEKNO",
+                           "BYHOUR", "BYMINUTE", "BYSECOND"}
+ICS_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+def _parse_rrule(value):
+    """
+    Map an RRULE onto a recurrence rule. Raises ValueError for rules that
+    can't be represented, rather than importing a different schedule.
+    BYDAY/BYMONTHDAY/COUNT are kept raw and checked once DTSTART is known.
+    """
+    parts = {k.upper(): v for k, v in (p.split("=", 1) for p in value.split(";") if "=" in p)}
+    freq = RRULE_FREQS.get(parts.get("FREQ", "").upper())
+    if not freq:
+        raise ValueError(f"unsupported FREQ in {value}")
+    unsupported = UNSUPPORTED_RRULE_PARTS & parts.keys()
+    if unsupported:
+        raise ValueError(f"unsupported {', '.join(sorted(unsupported))} in {value}")
+    try:
+        rule = {"freq": freq, "interval": int(parts.get("INTERVAL", 1))}
+        if "COUNT" in parts:
+            rule["count"] = int(parts["COUNT"])
+    except ValueError:
+        raise ValueError(f"bad INTERVAL/COUNT in {value}")
+    if rule["interval"] < 1 or rule.get("count", 1) < 1:
+        raise ValueError(f"bad INTERVAL/COUNT in {value}")
+    if "BYDAY" in parts:
+        days = set(parts["BYDAY"].upper().split(","))
+        if freq in ("weekly", "daily") and days == WEEKDAYS and rule["interval"] == 1:
+            rule["freq"] = "weekdays"
+        else:
+            rule["byday"] = days
+    if "BYMONTHDAY" in parts:
+        rule["bymonthday"] = parts["BYMONTHDAY"]
+    if "UNTIL" in parts:
+        rule["until"] = parts["UNTIL"]
+    return rule
+
+
+def _check_rule(rule, start):
+    """Reject BYDAY/BYMONTHDAY unless they only restate DTSTART."""
+    byday = rule.pop("byday", None)
+    if byday is not None and not (rule["freq"] == "weekly" and byday == {ICS_WEEKDAYS[start.weekday()]}):
+        raise ValueError(f"BYDAY={','.join(sorted(byday))} is not supported")
+    bymonthday = rule.pop("bymonthday", None)
+    if bymonthday is not None and not (rule["freq"] == "monthly" and bymonthday == str(start.day)):
+        raise ValueError(f"BYMONTHDAY={bymonthday} is not supported")
+
+
+def iter_ics(fp):
+    """
+    Stream VEVENTs from an .ics file as raw entries (times not yet resolved).
+    An event whose RRULE can't be represented carries an "error" instead.
+    """
+    event = None
+    for line in _unfolded(fp):
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT":
+            if event and event.get("task") and event.get("time"):
+                yield event
+            event = None
+        elif event is not None and ":" in line:
+            name, value = line.split(":", 1)
+            name, _, params = name.partition(";")
+            name = name.upper()
+            if name == "SUMMARY":
+                event["task"] = _unescape(value)
+            elif name == "DTSTART":
+                event["time"] = value
+                for param in params.split(";"):
+                    key, _, tzid = param.partition("=")
+                    if key.upper() == "TZID":
+                        event["tzid"] = tzid.strip('"')
+            elif name == "CATEGORIES":
+                event["tag"] = _unescape(value.split(",")[0])
+            elif name == "RRULE":
+                try:
+                    event["recur"] = _parse_rrule(value)
+                except ValueError as e:
+                    event["error"] = str(e)
+
+
+def iter_csv(fp):
+    """Stream rows from a CSV with at least `task` and `time` columns."""
+    for row in csv.DictReader(fp):
+        task, when = (row.get("task") or "").strip(), (row.get("time") or "").strip()
+        if not task or not when:
+            continue
+        entry = {"task": task, "time": when, "tag": (row.get("tag") or "").strip() or None}
+        if row.get("recur"):
+            freq = row["recur"].strip()
+            try:
+                interval = int(row.get("interval") or 1)
+            except ValueError:
+                interval = 0
+            if freq not in RECUR_FREQS or interval < 1:
+                entry["error"] = f"bad recurrence {freq!r} / interval {row.get('interval')!r}"
+            else:
+                entry["recur"] = {"freq": freq, "interval": interval}
+                if row.get("until"):
+                    entry["recur"]["until"] = row["until"].strip()
+        yield entry
+
+
+def _fast_parse(value):
+    """Parse the machine formats we expect without going through dateparser."""
+    utc = value.endswith("Z")
+    raw = value[:-1] if utc else value
+    for fmt in (ICS_TIME, ICS_DATE):
+        try:
+            dt = datetime.strptime(raw, fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        try:
+            dt = datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+    if utc:
+        dt = dt.replace(tzinfo=timezone.utc)
+    if dt.tzinfo is not None:
+        # Reminders are stored as naive local time
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def _from_zone(dt, tzid):
+    """Naive local time for wall-clock `dt` in the iCalendar zone `tzid`."""
+    try:
+        zone = ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown TZID {tzid!r}")
+    return dt.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+
+
+def resolve_times(values):
+    """
+    Resolve a batch of date strings to datetimes. Each distinct string is parsed
+    once; machine formats skip dateparser entirely.
+    """
+    resolved = {}
+    for value in set(values):
+        dt = _fast_parse(value)
+        if dt is None:
+            dt = dateparser.parse(value, settings={'PREFER_DATES_FROM': 'future'})
+        resolved[value] = dt
+    return resolved
+
+
+def load_entries(path, problems=None, now=None):
+    """
+    Read an .ics or .csv file into reminder entries ready for import.
+
+    Past one-shot events are stored as already triggered, and past series are
+    moved on to their next occurrence, so an import never replays history.
+    Entries that can't be imported faithfully are skipped and, if `problems`
+    is a list, described there.
+    """
+    problems = problems if problems is not None else []
+    now = now or datetime.now()
+    reader = iter_ics if path.lower().endswith(".ics") else iter_csv
+    with open(path, newline="", encoding="utf-8") as fp:
+        raw = list(reader(fp))
+
+    values = [e["time"] for e in raw]
+    values += [e["recur"]["until"] for e in raw if e.get("recur") and e["recur"].get("until")]
+    times = resolve_times(values)
+
+    entries = []
+    for e in raw:
+        if e.get("error"):
+            problems.append(f"{e['task']!r}: {e['error']}")
+            continue
+        when = times.get(e["time"])
+        if when is None:
+            problems.append(f"{e['task']!r}: could not parse time {e['time']!r}")
+            continue
+        if e.get("tzid") and not e["time"].endswith("Z"):
+            try:
+                when = _from_zone(when, e["tzid"])
+            except ValueError as err:
+                problems.append(f"{e['task']!r}: {err}")
+                continue
+        entry = {"task": e["task"].strip(), "time": when.isoformat(), "triggered": False,
+                 "tag": e.get("tag") or "general"}
+
+        recur = dict(e["recur"]) if e.get("recur") else None
+        if recur:
+            try:
+                _check_rule(recur, when)
+            except ValueError as err:
+                problems.append(f"{e['task']!r}: {err}")
+                continue
+            when = first_occurrence(when, recur)
+            if recur["freq"] == "monthly":
+                recur.setdefault("day", when.day)
+            until = None
+            if recur.get("until"):
+                raw_until = recur["until"]
+                until = times.get(raw_until)
+                if until is None:
+                    problems.append(f"{e['task']!r}: could not parse end {raw_until!r}")
+                    continue
+                if len(raw_until) in (8, 10):
+                    # A date-only UNTIL includes that whole day
+                    until = until.replace(hour=23, minute=59, second=59)
+            count = recur.pop("count", None)
+            if count:
+                last = when
+                for _ in range(count - 1):
+                    last = next_occurrence(last, recur)
+                until = min(until, last) if until else last
+            if until:
+                recur["until"] = until.isoformat()
+            nxt = upcoming_occurrence(when, recur, now)
+            if nxt is None:
+                entry["triggered"] = True
+            else:
+                when = nxt
+            entry["time"] = when.isoformat()
+            entry["recur"] = recur
+        elif when <= now:
+            entry["triggered"] = True
+        entries.append(entry)
+    return entries
+
+
+# === Export ===
+
+def _rrule(recur):
+    if recur["freq"] == "weekdays":
+        rule = "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"
+    else:
+        rule = f"FREQ={recur['freq'].upper()}"
+    if recur.get("interval", 1) != 1:
+        rule += f";INTERVAL={recur['interval']}"
+    if recur.get("until"):
+        rule += ";UNTIL=" + datetime.fromisoformat(recur["until"]).strftime(ICS_TIME)
+    return rule
+
+
+def _fold(line):
+    # RFC 5545: content lines longer than 75 octets are folded
+    if len(line) <= 75:
+        return line + "\r\n"
+    chunks = [line[:75]] + [" " + line[i:i + 74] for i in range(75, len(line), 74)]
+    return "\r\n".join(chunks) + "\r\n"
+
+
+def write_ics(reminders, fp):
+    """Write reminders to `fp` one event at a time."""
+    stamp = datetime.now(timezone.utc).strftime(ICS_TIME) + "Z"
+    fp.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Ethos Butler//Reminders//EN\r\n")
+    for i, r in enumerate(reminders):
+        when = datetime.fromisoformat(r["time"])
+        fp.write("BEGIN:VEVENT\r\n")
+        fp.write(f"UID:ethos-{i}-{when.strftime(ICS_TIME)}@ethos\r\n")
+        fp.write(f"DTSTAMP:{stamp}\r\n")
+        fp.write(f"DTSTART:{when.strftime(ICS_TIME)}\r\n")
+        fp.write(_fold(f"SUMMARY:{_escape(r['task'])}"))
+        if r.get("tag"):
+            fp.write(_fold(f"CATEGORIES:{_escape(r['tag'])}"))
+        if r.get("recur"):
+            fp.write(f"RRULE:{_rrule(r['recur'])}\r\n")
+        fp.write("END:VEVENT\r\n")
+    fp.write("END:VCALENDAR\r\n")
+
+
+def write_csv(reminders, fp):
+    """Write reminders to `fp` one row at a time."""
+    writer = csv.writer(fp)
+    writer.writerow(CSV_FIELDS)
+    for r in reminders:
+        recur = r.get("recur") or {}
+        writer.writerow([r["task"], r["time"], r.get("tag") or "",
+                         recur.get("freq", ""), recur.get("until", ""),
+                         recur.get("interval", "") if recur else ""])
+
+
+def export_reminders(reminders, path):
+    writer = write_ics if path.lower().endswith(".ics") else write_csv
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as fp:
+        writer(reminders, fp)
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    from memory.reminders import ReminderManager
+
+    if len(sys.argv) != 3 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python3 -m memory.calendar_io import|export <file.ics|file.csv>")
+        sys.exit(1)
+
+    manager = ReminderManager()
+    if sys.argv[1] == "import":
+        problems = []
+        added, skipped = manager.import_reminders(load_entries(sys.argv[2], problems))
+        for problem in problems:
+            print(f"⚠️ Skipped {problem}")
+        print(f"✅ Imported {added} reminders ({skipped} duplicates, {len(problems)} unsupported skipped).")
+    else:
+        export_reminders(manager.list_reminders(include_triggered=True), sys.argv[2])
+        print(f"✅ Exported reminders to {sys.argv[2]}.")
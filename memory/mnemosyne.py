@@ -9,13 +9,13 @@ MEMORY_FILE = os.path.join(os.path.dirname(__file__), "memory_store.json")
 
 class MemoryManager:
     def __init__(self, filepath="memory/memory.json"):
-        self.filepath = filepath
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self.filepath = filepath or MEMORY_FILE
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
         self._load_memory()
 
     def _load_memory(self):
-        if os.path.exists(MEMORY_FILE):
-            with open(MEMORY_FILE, "r") as f:
+        if os.path.exists(self.filepath):
+            with open(self.filepath, "r") as f:
                 try:
                     self.memories = json.load(f)
                 except json.JSONDecodeError:
@@ -25,7 +25,7 @@ class MemoryManager:
             self._save_memory()
 
     def _save_memory(self):
-        with open(MEMORY_FILE, "w") as f:
+        with open(self.filepath, "w") as f:
             json.dump(self.memories, f, indent=2)
 
     def add_memory(self, content: str, metadata: Optional[Dict] = None):
@@ -3,19 +3,30 @@
 import newspaper
 import feedparser
 import subprocess
+import time
+from utils.fetch import fetcher, FetchError
+from utils.logger import setup_logging
+
+# Hard ceiling (seconds) on all network work for one run
+DEADLINE = 20.0
 
 def speak(text):
     subprocess.run(["python3", "scripts/say.py", text])
 
 def scrape_top_articles(feed_url, max_articles=3):
     articles = []
-    feed = feedparser.parse(feed_url)
+    deadline = time.monotonic() + DEADLINE
+    try:
+        feed = feedparser.parse(fetcher.get(feed_url, deadline=deadline))
+    except FetchError:
+        return articles
     for entry in feed.entries[:max_articles]:
         article = newspaper.Article(entry.link)
         try:
-            article.download()
+            html = fetcher.get(entry.link, deadline=deadline)
+            article.download(input_html=html.decode("utf-8", errors="replace"))
             article.parse()
-        except:
+        except Exception:
             continue  # skip if article fails to load
 
         articles.append({
@@ -24,8 +35,10 @@ def scrape_top_articles(feed_url, max_articles=3):
         })
     return articles
 
+setup_logging()
 feed_url = 'http://feeds.arstechnica.com/arstechnica/index'
 articles = scrape_top_articles(feed_url)
+fetcher.log_stats()
 
 # Speak and display the top 3 headlines
 speak("Here are the top 3 headlines from Ars Technica today.")
@@ -5,17 +5,268 @@ import json
 import threading
 import time
 import re
-from datetime import datetime
+import calendar
+import bisect
+import heapq
+import itertools
+from datetime import datetime, timedelta
 import dateparser
 
 REMINDER_FILE = os.path.join(os.path.dirname(__file__), "reminders.json")
 
+RECUR_FREQS = ("daily", "weekdays", "weekly", "monthly", "hourly")
+
+# Time phrases inside a sentence: "at 10am", "tomorrow at 6pm", "friday 9:30", "in 20 minutes"
+_DAY = r"(?:today|tonight|tomorrow|(?:on |next )?(?:mon|tues|wednes|thurs|fri|satur|sun)day)"
+_CLOCK = r"(?:\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2}|noon|midnight)"
+TIME_PHRASE = re.compile(
+    rf"\b(?:{_DAY}\s+)?(?:at\s+)?{_CLOCK}(?:\s+{_DAY})?\b|\bin \d+ (?:minutes?|hours?|days?)\b|\b{_DAY}\b",
+    re.IGNORECASE,
+)
+CLOCK_TIME = re.compile(rf"\b{_CLOCK}\b", re.IGNORECASE)
+
+
+def _add_months(dt, months):
+    month = dt.month - 1 + months
+    year = dt.year + month // 12
+    month = month % 12 + 1
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
+
+
+def next_occurrence(dt, recur):
+    """Return the occurrence after `dt` for a recurrence rule."""
+    freq = recur["freq"]
+    interval = recur.get("interval", 1)
+    if interval < 1:
+        raise ValueError(f"Recurrence interval must be at least 1, got {interval}")
+    if freq == "hourly":
+        return dt + timedelta(hours=interval)
+    if freq == "daily":
+        return dt + timedelta(days=interval)
+    if freq == "weekly":
+        return dt + timedelta(weeks=interval)
+    if freq == "monthly":
+        # Anchor on the original day so a 31st doesn't drift to the 28th forever
+        anchor = recur.get("day", dt.day)
+        nxt = _add_months(dt.replace(day=1), interval)
+        return nxt.replace(day=min(anchor, calendar.monthrange(nxt.year, nxt.month)[1]))
+    if freq == "weekdays":
+        nxt = dt + timedelta(days=1)
+        while nxt.weekday() >= 5:
+            nxt += timedelta(days=1)
+        return nxt
+    raise ValueError(f"Unknown recurrence: {freq}")
+
+
+def upcoming_occurrence(dt, recur, now):
+    """
+    The first occurrence at or after `dt` that is later than `now`, or None if
+    the rule's end date comes first.
+    """
+    while dt <= now:
+        dt = next_occurrence(dt, recur)
+    until = recur.get("until")
+    if until and dt > _local(datetime.fromisoformat(until)):
+        return None
+    return dt
+
+
+def first_occurrence(dt, recur):
+    """Move a rule's starting time onto a day the rule actually fires."""
+    if recur["freq"] == "weekdays":
+        while dt.weekday() >= 5:
+            dt += timedelta(days=1)
+    return dt
+
+
+def find_time(text: str):
+    """
+    Parse the first time phrase found in a sentence, e.g. the "at 10am" in
+    "stretch at 10am". dateparser alone can't parse a whole sentence.
+    """
+    for match in TIME_PHRASE.finditer(text):
+        parsed = dateparser.parse(match.group(0), settings={'PREFER_DATES_FROM': 'future'})
+        if parsed:
+            return parsed
+    return None
+
+
+def parse_recurrence(text: str):
+    """
+    Pull a recurrence rule out of free text, e.g. "every day", "every weekday",
+    "every week", "every 3 hours", "every month until december".
+    Returns (rule or None, text with the recurrence phrase removed). Raises
+    ValueError for an interval below 1, which would never advance.
+    """
+    lowered = text.lower()
+    rule = None
+    # Only explicit "every ..." phrases, so words like "daily standup" stay in the task
+    patterns = [
+        (r"\bevery (\d+) hours?\b", "hourly"),
+        (r"\bevery (\d+) days?\b", "daily"),
+        (r"\bevery (\d+) weeks?\b", "weekly"),
+        (r"\bevery (\d+) months?\b", "monthly"),
+        (r"\bevery weekdays?\b", "weekdays"),
+        (r"\bevery hour\b", "hourly"),
+        (r"\bevery (?:day|morning|evening|night)\b", "daily"),
+        (r"\bevery week\b", "weekly"),
+        (r"\bevery month\b", "monthly"),
+    ]
+    for pattern, freq in patterns:
+        match = re.search(pattern, lowered)
+        if match:
+            interval = int(match.group(1)) if match.groups() else 1
+            if interval < 1:
+                raise ValueError(f"'{match.group(0)}' is not a valid repeat interval")
+            rule = {"freq": freq, "interval": interval}
+            text = re.sub(r"\s{2,}", " ", text[:match.start()] + text[match.end():]).strip()
+            break
+    if not rule:
+        return None, text
+
+    until = re.search(r"\buntil (.+)$", text, re.IGNORECASE)
+    if until:
+        until_dt = dateparser.parse(until.group(1), settings={'PREFER_DATES_FROM': 'future'})
+        if until_dt:
+            if not CLOCK_TIME.search(until.group(1)):
+                # "until friday" includes Friday's own occurrences
+                until_dt = until_dt.replace(hour=23, minute=59, second=59, microsecond=0)
+            rule["until"] = until_dt.isoformat()
+            text = text[:until.start()].strip()
+    return rule, text
+
+
+def _local(dt):
+    """Naive local time for `dt`; aware datetimes are converted to the local zone."""
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def expand(reminder, start, end, limit=None):
+    """Yield occurrence datetimes of a recurring reminder within [start, end)."""
+    recur = reminder["recur"]
+    when = _local(datetime.fromisoformat(reminder["time"]))
+    until = _local(datetime.fromisoformat(recur["until"])) if recur.get("until") else None
+    count = 0
+    while (end is None or when < end) and (until is None or when <= until):
+        if when >= start:
+            yield when
+            count += 1
+            if limit is not None and count >= limit:
+                return
+        when = next_occurrence(when, recur)
+
+
+class ReminderIndex:
+    """
+    Pending reminders bucketed by local day. Each bucket is kept sorted and the
+    list of non-empty days is sorted too, so day/week/next-N queries only touch
+    the days they ask about. Recurring reminders are few and kept aside, then
+    expanded on the fly for the requested window.
+    """
+
+    def __init__(self, reminders=()):
+        self.buckets = {}     # date -> sorted [(time, seq, reminder)]
+        self.days = []        # sorted dates that have a bucket
+        self.recurring = []
+        self.entries = {}     # id(reminder) -> its bucket entry
+        self.seq = itertools.count()
+        for r in reminders:
+            self.add(r)
+
+    def add(self, reminder):
+        if reminder.get("triggered"):
+            return
+        if reminder.get("recur"):
+            self.recurring.append(reminder)
+            return
+        when = _local(datetime.fromisoformat(reminder["time"]))
+        entry = (when, next(self.seq), reminder)
+        day = when.date()
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = self.buckets[day] = []
+            bisect.insort(self.days, day)
+        bisect.insort(bucket, entry)
+        self.entries[id(reminder)] = entry
+
+    def remove(self, reminder):
+        if reminder.get("recur"):
+            self.recurring = [r for r in self.recurring if r is not reminder]
+            return
+        entry = self.entries.pop(id(reminder), None)
+        if entry is None:
+            return
+        day = entry[0].date()
+        bucket = self.buckets[day]
+        del bucket[bisect.bisect_left(bucket, entry[:2])]
+        if not bucket:
+            del self.buckets[day]
+            del self.days[bisect.bisect_left(self.days, day)]
+
+    def due(self, now):
+        """Pending reminders whose time is at or before `now`."""
+        out = []
+        for day in self.days:
+            if day > now.date():
+                break
+            for when, _, r in self.buckets[day]:
+                if when > now:
+                    break
+                out.append(r)
+        out += [r for r in self.recurring
+                if _local(datetime.fromisoformat(r["time"])) <= now]
+        return out
+
+    def between(self, start, end):
+        """(datetime, reminder) pairs within [start, end), sorted by time."""
+        one_shot = []
+        i = bisect.bisect_left(self.days, start.date())
+        while i < len(self.days) and self.days[i] < end.date() + timedelta(days=1):
+            for when, _, r in self.buckets[self.days[i]]:
+                if when >= end:
+                    break
+                if when >= start:
+                    one_shot.append((when, r))
+            i += 1
+        repeats = sorted(((when, r) for r in self.recurring for when in expand(r, start, end)),
+                         key=lambda pair: pair[0])
+        return list(heapq.merge(one_shot, repeats, key=lambda pair: pair[0]))
+
+    def upcoming(self, n, now):
+        """The next `n` occurrences from `now`."""
+        one_shot = []
+        i = bisect.bisect_left(self.days, now.date())
+        while i < len(self.days) and len(one_shot) < n:
+            one_shot += [(when, r) for when, _, r in self.buckets[self.days[i]] if when >= now]
+            i += 1
+        repeats = sorted(((when, r) for r in self.recurring for when in expand(r, now, None, limit=n)),
+                         key=lambda pair: pair[0])
+        return list(heapq.merge(one_shot, repeats, key=lambda pair: pair[0]))[:n]
+
+    def pending(self):
+        """Every pending reminder, soonest first (recurring ones by next occurrence)."""
+        one_shot = [(when, r) for day in self.days for when, _, r in self.buckets[day]]
+        repeats = sorted(((_local(datetime.fromisoformat(r["time"])), r) for r in self.recurring),
+                         key=lambda pair: pair[0])
+        return [r for _, r in heapq.merge(one_shot, repeats, key=lambda pair: pair[0])]
+
+
 class ReminderManager:
     def __init__(self):
         os.makedirs(os.path.dirname(REMINDER_FILE), exist_ok=True)
+        self.mtime = self._mtime()
         self.reminders = self._load()
+        self.index = ReminderIndex(self.reminders)
         self.lock = threading.Lock()
 
+    @staticmethod
+    def _mtime():
+        try:
+            return os.stat(REMINDER_FILE).st_mtime_ns
+        except OSError:
+            return None
+
     def _load(self):
         if os.path.exists(REMINDER_FILE):
             try:
@@ -26,10 +277,34 @@ class ReminderManager:
         return []
 
     def _save(self):
-        with open(REMINDER_FILE, "w") as f:
+        # Write to a temp file and swap it in so a crash never leaves half a store
+        tmp = REMINDER_FILE + ".tmp"
+        with open(tmp, "w") as f:
             json.dump(self.reminders, f, indent=2)
+        os.replace(tmp, REMINDER_FILE)
+        self.mtime = self._mtime()
 
-    def add_reminder(self, task: str, when: str, tag: str = None):
+    def _sync(self):
+        # Another process (the agenda, a calendar import) may have saved since we
+        # last read or wrote; pick that up under the lock before touching the store,
+        # or our next _save() would write back a stale list over it
+        mtime = self._mtime()
+        if mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        self.reminders = self._load()
+        self.index = ReminderIndex(self.reminders)
+        return True
+
+    def refresh(self):
+        """
+        Reload the store if another process has saved it since this manager last
+        read or wrote it. Returns True if it was reloaded.
+        """
+        with self.lock:
+            return self._sync()
+
+    def add_reminder(self, task: str, when: str, tag: str = None, recur: dict = None):
         parsed_time = dateparser.parse(when)
         if not parsed_time:
             return False
@@ -40,22 +315,120 @@ class ReminderManager:
             "triggered": False,
             "tag": tag or "general"
         }
+        if recur:
+            if recur.get("freq") not in RECUR_FREQS or recur.get("interval", 1) < 1:
+                return False
+            recur = dict(recur)
+            parsed_time = first_occurrence(parsed_time, recur)
+            entry["time"] = parsed_time.isoformat()
+            if recur["freq"] == "monthly":
+                recur.setdefault("day", parsed_time.day)
+            entry["recur"] = recur
         with self.lock:
+            self._sync()
             self.reminders.append(entry)
+            self.index.add(entry)
             self._save()
         return True
 
+    def import_reminders(self, entries):
+        """
+        Add already-resolved entries (see memory.calendar_io.load_entries) in one
+        batch, skipping any whose task and time match an existing reminder.
+        Returns (added, skipped).
+        """
+        added = skipped = 0
+        with self.lock:
+            self._sync()
+            seen = {(r["task"], r["time"]) for r in self.reminders}
+            for entry in entries:
+                key = (entry["task"], entry["time"])
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+                self.reminders.append(entry)
+                self.index.add(entry)
+                added += 1
+            if added:
+                self._save()
+        return added, skipped
+
+    def _advance(self, reminder, now):
+        """
+        Move a recurring reminder to its next occurrence after `now`.
+        Missed occurrences (e.g. while the butler was off) are skipped, not replayed.
+        """
+        recur = reminder["recur"]
+        current = _local(datetime.fromisoformat(reminder["time"]))
+        nxt = upcoming_occurrence(next_occurrence(current, recur), recur, now)
+        if nxt is None:
+            reminder["triggered"] = True
+        else:
+            reminder["time"] = nxt.isoformat()
+
     def check_and_trigger(self, callback):
         now = datetime.now()  # Use local time
+        due = []
         with self.lock:
-            for reminder in self.reminders:
-                if not reminder["triggered"]:
-                    remind_time = datetime.fromisoformat(reminder["time"])
-                    if remind_time <= now:
-                        callback(reminder["task"], reminder["time"])
-                        reminder["triggered"] = True
-            self._save()
+            self._sync()
+            for reminder in self.index.due(now):
+                due.append((reminder["task"], reminder["time"]))
+                if reminder.get("recur"):
+                    self._advance(reminder, now)
+                    if reminder["triggered"]:
+                        self.index.remove(reminder)
+                else:
+                    self.index.remove(reminder)
+                    reminder["triggered"] = True
+            if due:
+                self._save()
+        # Callbacks log and speak, so run them after the lock is released
+        for task, when in due:
+            callback(task, when)
 
     def list_reminders(self, include_triggered=False):
+        """Pending reminders soonest first, or the whole store with include_triggered."""
+        with self.lock:
+            self._sync()
+            if include_triggered:
+                return list(self.reminders)
+            return self.index.pending()
+
+    def delete_reminder(self, index: int):
+        """Delete the reminder at `index` in list_reminders() order."""
+        with self.lock:
+            self._sync()
+            pending = self.index.pending()
+            if not 0 <= index < len(pending):
+                return False
+            target = pending[index]
+            self.index.remove(target)
+            self.reminders = [r for r in self.reminders if r is not target]
+            self._save()
+        return True
+
+    def occurrences(self, start: datetime, end: datetime):
+        """
+        Expand pending reminders into (datetime, reminder) pairs within [start, end),
+        generating recurring instances on the fly. Sorted by time.
+        """
+        with self.lock:
+            self._sync()
+            return self.index.between(start, end)
+
+    def upcoming(self, n: int, now: datetime = None):
         with self.lock:
-            return [r for r in self.reminders if include_triggered or not r["triggered"]]
+            self._sync()
+            return self.index.upcoming(n, now or datetime.now())
+
+    def day(self, offset: int = 0, now: datetime = None):
+        """Occurrences on today (offset 0), tomorrow (1), and so on."""
+        now = now or datetime.now()
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=offset)
+        return self.occurrences(start, start + timedelta(days=1))
+
+    def this_week(self, now: datetime = None):
+        now = now or datetime.now()
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
+        return self.occurrences(start, start + timedelta(days=7))
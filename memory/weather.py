@@ -0,0 +1,165 @@
+# memory/weather.py
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from open_meteo import OpenMeteo
+from open_meteo.models import DailyParameters
+
+# ✅ Config
+LOCATIONS = {
+    "home": (41.27, -72.97),  # West Haven, CT
+}
+DEFAULT_LOCATION = "home"
+DAILY_PARAMS = [
+    DailyParameters.TEMPERATURE_2M_MAX,
+    DailyParameters.PRECIPITATION_SUM,
+    DailyParameters.WIND_SPEED_10M_MAX,
+    DailyParameters.WEATHER_CODE,
+]
+CACHE_FILE = os.path.join(os.path.dirname(__file__), "weather_cache.json")
+CACHE_TTL = 30 * 60  # seconds
+
+
+def c_to_f(c): return round(c * 9 / 5 + 32, 1)
+
+
+class WeatherService:
+    """
+    Daily forecasts for the configured locations, behind a TTL cache keyed by
+    location, day and requested parameters. The cache is persisted so restarts
+    (and the separate agenda process) start warm.
+    """
+
+    def __init__(self, locations=None, ttl=CACHE_TTL, cache_file=CACHE_FILE):
+        self.locations = locations or LOCATIONS
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.mtime = self._mtime()
+        self.cache = self._load()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.cache_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self):
+        # The agenda process writes the same file; pick up its entries before
+        # reading or writing so neither process clobbers the other's fetches
+        mtime = self._mtime()
+        if mtime != self.mtime:
+            self.mtime = mtime
+            self.cache = self._load()
+
+    def _load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                return {}
+        return {}
+
+    def _save(self):
+        # The agenda process shares this file, so each writer uses its own temp name
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.cache_file) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.cache, f)
+            os.replace(tmp, self.cache_file)
+            self.mtime = self._mtime()
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @staticmethod
+    def _key(lat, lon, day, params):
+        names = ",".join(sorted(p.value for p in params))
+        return f"{lat:.2f},{lon:.2f}|{day}|{names}"
+
+    def _fresh(self, key):
+        entry = self.cache.get(key)
+        if entry and time.time() - entry["fetched"] < self.ttl:
+            return entry["values"]
+        return None
+
+    def _prune(self, today):
+        # Entries for past days can never be hit again
+        stale = [k for k in self.cache if k.split("|")[1] < today]
+        for k in stale:
+            del self.cache[k]
+
+    async def _fetch(self, om, lat, lon, params):
+        forecast = await om.forecast(latitude=lat, longitude=lon, daily=params, timezone="auto")
+        daily = forecast.daily
+        return {p.value: getattr(daily, p.value)[0] for p in params}
+
+    async def forecasts(self, names=None, params=None):
+        """Return {location name: {param: today's value}} for the given locations."""
+        names = names or list(self.locations)
+        params = params or DAILY_PARAMS
+        today = date.today().isoformat()
+
+        results, missing = {}, []
+        with self.lock:
+            self._refresh()
+            for name in names:
+                lat, lon = self.locations[name]
+                values = self._fresh(self._key(lat, lon, today, params))
+                if values is not None:
+                    results[name] = values
+                else:
+                    missing.append(name)
+
+        if missing:
+            async with OpenMeteo() as om:
+                fetched = await asyncio.gather(
+                    *(self._fetch(om, *self.locations[name], params) for name in missing),
+                    return_exceptions=True,
+                )
+            with self.lock:
+                self._refresh()
+                for name, values in zip(missing, fetched):
+                    lat, lon = self.locations[name]
+                    key = self._key(lat, lon, today, params)
+                    if isinstance(values, Exception):
+                        # Serve an expired entry for today rather than nothing
+                        entry = self.cache.get(key)
+                        if entry:
+                            results[name] = entry["values"]
+                        continue
+                    self.cache[key] = {"fetched": time.time(), "values": values}
+                    results[name] = values
+                self._prune(today)
+                try:
+                    self._save()
+                except OSError as e:
+                    # Persistence is best effort; never lose fresh results over it
+                    print(f"[WeatherService] Could not save cache: {e}")
+
+        return results
+
+    async def forecast(self, name=DEFAULT_LOCATION, params=None):
+        return (await self.forecasts([name], params)).get(name)
+
+
+def describe(name, values):
+    max_f = c_to_f(values["temperature_2m_max"])
+    return (
+        f"{name.title()}: high of {max_f}°F, "
+        f"{values['precipitation_sum']} mm rain, "
+        f"wind up to {values['wind_speed_10m_max']} km/h."
+    )
+
+
+if __name__ == "__main__":
+    service = WeatherService()
+    for name, values in asyncio.run(service.forecasts()).items():
+        print(describe(name, values))
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+# server.py
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import aclosing
+from datetime import datetime
+from aiohttp import web, WSMsgType
+from dateparser import parse as parse_date
+
+import main as butler
+from memory.mnemosyne import MemoryManager
+from nlu import extract_intent_entities
+from utils.llm_session import OllamaSession
+
+# ✅ Config
+HOST, PORT = "127.0.0.1", 8765
+LLM_CONCURRENCY = 2        # simultaneous generations sent to Ollama
+LLM_QUEUE_LIMIT = 32       # waiting generations before new ones are refused
+SESSION_TTL = 60 * 60      # idle seconds before a session is dropped
+SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory", "sessions")
+SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# Intents that only make sense at the local console: exit stops the process and
+# agenda spawns the spoken morning-agenda loop on the butler's own machine
+LOCAL_ONLY = {"exit", "agenda"}
+
+log = logging.getLogger("ethos.server")
+
+
+class Busy(Exception):
+    pass
+
+
+class LLMGate:
+    """Bounded concurrency toward the LLM with a bounded wait queue."""
+
+    def __init__(self, concurrency=LLM_CONCURRENCY, queue_limit=LLM_QUEUE_LIMIT):
+        self.sem = asyncio.Semaphore(concurrency)
+        self.queue_limit = queue_limit
+        self.waiting = 0
+
+    async def __aenter__(self):
+        if self.sem.locked() and self.waiting >= self.queue_limit:
+            raise Busy()
+        self.waiting += 1
+        try:
+            await self.sem.acquire()
+        finally:
+            self.waiting -= 1
+
+    async def __aexit__(self, *exc):
+        self.sem.release()
+
+
+class Session:
+    def __init__(self, session_id):
+        self.id = session_id
+        self.chat = OllamaSession()
+        self.memory = MemoryManager(os.path.join(SESSION_DIR, f"{session_id}.json"))
+        self.last_seen = time.monotonic()
+        self.lock = asyncio.Lock()  # one turn at a time per session
+
+
+class ButlerServer:
+    def __init__(self, concurrency=LLM_CONCURRENCY, queue_limit=LLM_QUEUE_LIMIT):
+        self.sessions = {}
+        self.gate = LLMGate(concurrency, queue_limit)
+        # Dispatch handlers share the console and reminder store, so run them one at a time
+        self.dispatch_lock = threading.Lock()
+        # llm_fallback=False: the reminder time fallback goes through the gate in _reminder_time
+        self.args = argparse.Namespace(silent=True, memory_off=False, voice=False, nlu_off=False,
+                                       llm_fallback=False)
+
+    def session(self, session_id=None):
+        if session_id and not SESSION_ID.match(session_id):
+            raise web.HTTPBadRequest(text="invalid session id")
+        session_id = session_id or uuid.uuid4().hex
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(session_id)
+        session.last_seen = time.monotonic()
+        return session
+
+    async def reap_sessions(self):
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.monotonic() - SESSION_TTL
+            for sid in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff]:
+                del self.sessions[sid]
+
+    # === Turn handling ===
+
+    def _run_dispatch(self, intent, nlu_result, text):
+        captured = []
+        collector = logging.Handler(level=logging.INFO)
+        collector.emit = lambda record: captured.append(record.getMessage())
+        with self.dispatch_lock:
+            butler.log.addHandler(collector)
+            try:
+                with butler.console.capture() as capture:
+                    if intent == "delete_reminder":
+                        butler.handle_delete_reminder(text, args=self.args)
+                    else:
+                        butler.dispatch[intent](nlu_result, args=self.args)
+            finally:
+                butler.log.removeHandler(collector)
+        return "\n".join(filter(None, [capture.get().strip()] + captured))
+
+    async def _reminder_time(self, nlu_result):
+        """
+        Fill in a reminder time the NLU couldn't parse by asking the LLM, under
+        the same gate as chat. The question runs in a throwaway stateless session
+        so it never touches a client's conversation.
+        """
+        when = nlu_result.get("time")
+        if when and parse_date(when, settings={'PREFER_DATES_FROM': 'future'}):
+            return nlu_result
+        if butler.find_time(nlu_result["task"]):
+            return nlu_result  # handle_reminder will find it in the sentence
+        async with self.gate:
+            reply = await asyncio.to_thread(
+                OllamaSession(system=None).ask,
+                butler.reminder_time_prompt(nlu_result["task"]), max_tokens=50)
+        extracted = butler.time_from_llm(reply.strip())
+        return dict(nlu_result, time=extracted) if extracted else nlu_result
+
+    async def _stream_llm(self, session, text):
+        """
+        Async generator of tokens for `text` in `session`, gated by the LLM limit.
+        If the consumer goes away mid-stream, the producer thread is told to stop
+        and the gate slot is only released once that thread (and its Ollama
+        request) has actually finished.
+        """
+        async with self.gate:
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue()
+            done = object()
+            stop = threading.Event()
+
+            def produce():
+                tokens = session.chat.stream(text)
+                try:
+                    for token in tokens:
+                        if stop.is_set():
+                            break
+                        loop.call_soon_threadsafe(queue.put_nowait, token)
+                except Exception as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+                finally:
+                    # Closing the generator closes the HTTP response, which stops
+                    # the generation; an abandoned turn never updates the context
+                    tokens.close()
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+            producer = threading.Thread(target=produce, daemon=True)
+            producer.start()
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                stop.set()
+                await asyncio.to_thread(producer.join)
+
+    async def turn(self, session, text):
+        """
+        Run one user turn. Yields ("token", str) while the LLM streams and
+        ends with ("result", dict).
+        """
+        async with session.lock:
+            nlu_result = await asyncio.to_thread(extract_intent_entities, text)
+            intent = nlu_result.get("intent")
+            if intent in LOCAL_ONLY:
+                yield "result", {"intent": intent, "output": f"'{intent}' is only available at the butler's console."}
+                return
+            if intent == "reminder":
+                nlu_result = await self._reminder_time(nlu_result)
+            if intent in butler.dispatch:
+                output = await asyncio.to_thread(self._run_dispatch, intent, nlu_result, text)
+                yield "result", {"intent": intent, "output": output}
+                return
+
+            response = ""
+            async with aclosing(self._stream_llm(session, text)) as tokens:
+                async for token in tokens:
+                    response += token
+                    yield "token", token
+            await asyncio.to_thread(
+                session.memory.save_interaction,
+                content=f"USER: {text}\nETHOS: {response}",
+                metadata={"timestamp": datetime.now().isoformat()},
+            )
+            yield "result", {"intent": "chat", "output": response, "stats": session.chat.last_stats}
+
+    # === HTTP ===
+
+    async def handle_create_session(self, request):
+        return web.json_response({"session": self.session().id})
+
+    async def handle_nlu(self, request):
+        body = await request.json()
+        return web.json_response(await asyncio.to_thread(extract_intent_entities, body.get("text", "")))
+
+    async def handle_message(self, request):
+        body = await request.json()
+        text = (body.get("text") or "").strip()
+        if not text:
+            raise web.HTTPBadRequest(text="missing text")
+        session = self.session(body.get("session"))
+
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        started = False
+        try:
+            async with aclosing(self.turn(session, text)) as turn:
+                async for kind, value in turn:
+                    if not started:
+                        await resp.prepare(request)
+                        started = True
+                    line = {"type": kind, "session": session.id}
+                    line.update({"token": value} if kind == "token" else value)
+                    await resp.write((json.dumps(line) + "\n").encode())
+        except Busy:
+            raise web.HTTPServiceUnavailable(text="LLM queue full", headers={"Retry-After": "1"})
+        await resp.write_eof()
+        return resp
+
+    async def handle_ws(self, request):
+        session = self.session(request.query.get("session"))
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        await ws.send_json({"type": "session", "session": session.id})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                text = (json.loads(msg.data).get("text") or "").strip()
+            except (ValueError, AttributeError):
+                text = ""
+            if not text:
+                await ws.send_json({"type": "error", "error": "missing text"})
+                continue
+            try:
+                # aclosing: a send to a vanished client must still close the turn
+                # (and stop its LLM stream) right away, not whenever it is collected
+                async with aclosing(self.turn(session, text)) as turn:
+                    async for kind, value in turn:
+                        if kind == "token":
+                            await ws.send_json({"type": "token", "token": value})
+                        else:
+                            await ws.send_json({"type": "result", **value})
+            except Busy:
+                await ws.send_json({"type": "busy", "retry_after": 1})
+            except Exception as e:
+                log.exception("WebSocket turn failed.")
+                await ws.send_json({"type": "error", "error": str(e)})
+        return ws
+
+    def app(self):
+        app = web.Application()
+        app.add_routes([
+            web.post("/sessions", self.handle_create_session),
+            web.post("/nlu", self.handle_nlu),
+            web.post("/message", self.handle_message),
+            web.get("/ws", self.handle_ws),
+        ])
+
+        async def start_reaper(app):
+            app["reaper"] = asyncio.create_task(self.reap_sessions())
+
+        async def stop_reaper(app):
+            app["reaper"].cancel()
+
+        app.on_startup.append(start_reaper)
+        app.on_cleanup.append(stop_reaper)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ethos Butler API server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--queue-limit", type=int, default=LLM_QUEUE_LIMIT)
+    args = parser.parse_args()
+
+    server = ButlerServer(args.llm_concurrency, args.queue_limit)
+    butler.console.print(f"[bold magenta]🛎️ Ethos API on http://{args.host}:{args.port}[/]")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
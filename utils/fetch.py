@@ -0,0 +1,193 @@
+# utils/fetch.py
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+import requests
+
+# Per-host policy; anything not listed uses "default"
+HOST_POLICIES = {
+    "default": {"timeout": 5.0, "retries": 2, "backoff": 0.3},
+    "labs.bible.org": {"timeout": 4.0, "retries": 1, "backoff": 0.5},
+}
+BREAKER_THRESHOLD = 3     # consecutive failures before a host is skipped
+BREAKER_COOLDOWN = 300    # seconds before a skipped host is tried again
+STATS_WINDOW = 100        # latency samples kept per endpoint
+READ_CHUNK = 16 * 1024    # body is read in chunks so the clock is checked as it arrives
+USER_AGENT = "Ethos-Butler/1.0"
+
+log = logging.getLogger("ethos.fetch")
+
+
+class FetchError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Per-host breaker. Not thread-safe on its own; Fetcher calls it under its lock."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        # Half-open: let a single probe through once the cooldown has passed
+        if not self.probing and time.monotonic() - self.opened_at >= self.cooldown:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            # A failed probe re-opens the breaker for a full cooldown
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+class Fetcher:
+    """
+    Outbound HTTP GET with per-host timeouts and retry budgets, exponential
+    backoff, circuit breakers, stale-on-failure and per-endpoint latency stats.
+
+    `deadline` is an absolute time.monotonic() value. Each attempt gets the
+    policy timeout or the time left, whichever is shorter, as a budget for the
+    whole response (requests' own timeouts only bound each connect and read),
+    and no backoff sleep runs past the deadline. An attempt can overrun its
+    budget by at most one socket read, itself capped at that budget.
+    """
+
+    def __init__(self, policies=None):
+        self.policies = policies or HOST_POLICIES
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.lock = threading.Lock()
+        self.breakers = {}
+        self.stale = {}
+        self.latency = {}
+        self.failures = {}
+
+    def _policy(self, host):
+        return {**self.policies["default"], **self.policies.get(host, {})}
+
+    def _breaker(self, host):
+        with self.lock:
+            return self.breakers.setdefault(host, CircuitBreaker())
+
+    def _record(self, url, elapsed, ok):
+        with self.lock:
+            self.latency.setdefault(url, deque(maxlen=STATS_WINDOW)).append(elapsed)
+            if not ok:
+                self.failures[url] = self.failures.get(url, 0) + 1
+
+    def _read(self, url, timeout, budget_end):
+        """Fetch `url`, giving up once the clock passes `budget_end` mid-body."""
+        with self.session.get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            # read1 returns whatever one socket read brings in, so a server that
+            # trickles bytes can't hold us inside a single large read
+            read = getattr(resp.raw, "read1", None) or resp.raw.read
+            chunks = []
+            while True:
+                chunk = read(READ_CHUNK, decode_content=True)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+                if time.monotonic() > budget_end:
+                    raise requests.Timeout(f"body not received within {timeout:.1f}s")
+
+    def get(self, url, deadline=None) -> bytes:
+        host = urlparse(url).hostname or ""
+        policy = self._policy(host)
+        breaker = self._breaker(host)
+        last_error = None
+
+        with self.lock:
+            allowed = breaker.allow()
+        if allowed:
+            for attempt in range(policy["retries"] + 1):
+                timeout = policy["timeout"]
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.monotonic())
+                    if timeout <= 0:
+                        last_error = FetchError("deadline exceeded")
+                        with self.lock:
+                            breaker.probing = False  # hand the probe to the next caller
+                        break
+
+                start = time.monotonic()
+                try:
+                    body = self._read(url, timeout, start + timeout)
+                except requests.RequestException as e:
+                    self._record(url, time.monotonic() - start, ok=False)
+                    with self.lock:
+                        breaker.record_failure()
+                        tripped = breaker.is_open
+                    last_error = e
+                    if tripped:
+                        break
+                    delay = policy["backoff"] * (2 ** attempt) * (0.5 + random.random())
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        break
+                    time.sleep(delay)
+                    continue
+
+                self._record(url, time.monotonic() - start, ok=True)
+                with self.lock:
+                    breaker.record_success()
+                    self.stale[url] = body
+                return body
+        else:
+            last_error = FetchError(f"circuit open for {host}")
+
+        with self.lock:
+            if url in self.stale:
+                return self.stale[url]
+        raise FetchError(f"{url}: {last_error}")
+
+    def get_json(self, url, deadline=None):
+        return json.loads(self.get(url, deadline=deadline))
+
+    def stats(self):
+        """Return {url: {"count", "failures", "p50_ms", "p95_ms", "max_ms"}}."""
+        with self.lock:
+            out = {}
+            for url, samples in self.latency.items():
+                ordered = sorted(samples)
+                n = len(ordered)
+                out[url] = {
+                    "count": n,
+                    "failures": self.failures.get(url, 0),
+                    "p50_ms": round(ordered[n // 2] * 1000, 1),
+                    "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+            return out
+
+    def log_stats(self):
+        """Log one latency line per endpoint fetched so far."""
+        for url, st in sorted(self.stats().items()):
+            log.info("%s: %d calls, %d failed, p50 %.0f ms, p95 %.0f ms, max %.0f ms",
+                     url, st["count"], st["failures"], st["p50_ms"], st["p95_ms"], st["max_ms"])
+
+
+# Shared instance so breakers and stale values are common to all callers
+fetcher = Fetcher()
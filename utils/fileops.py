@@ -0,0 +1,264 @@
+# utils/fileops.py
+
+import bisect
+import os
+import re
+import shutil
+import threading
+from collections import defaultdict
+
+# ✅ Config
+INDEX_DIRS = [os.path.expanduser("~/Documents"), os.path.expanduser("~/Downloads"), os.getcwd()]
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+COPY_CHUNK = 4 * 1024 * 1024
+TRIGRAM_SCAN_LIMIT = 5000   # posting-list entries walked per fuzzy lookup
+
+
+def _norm(name):
+    """Lowercased name with punctuation and spacing collapsed, for loose matching."""
+    return re.sub(r"[^a-z0-9.]+", "", name.lower())
+
+
+def _stem(name):
+    return _norm(os.path.splitext(name)[0])
+
+
+def _trigrams(s):
+    s = f"  {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class FileIndex:
+    """
+    In-memory index of the files under a set of directories, built with
+    os.scandir. Each directory's mtime is remembered so refresh() only rescans
+    directories whose entries changed.
+
+    Lookups go exact name -> normalised name -> stem -> prefix (bisect on a
+    sorted key list) and only fall back to trigram matching when all of those
+    miss. The fallback seeds candidates from the rarest trigrams, with a cap,
+    so common trigrams like ".pd" never cost a walk over the whole index.
+    """
+
+    def __init__(self, roots=None):
+        self.roots = [os.path.abspath(r) for r in (roots or INDEX_DIRS) if os.path.isdir(r)]
+        self.lock = threading.Lock()
+        self.dir_mtimes = {}            # dir -> mtime at last scan
+        self.dir_files = {}             # dir -> set of file names
+        self.dir_children = {}          # dir -> subdirectories at last scan
+        self.by_name = defaultdict(set)  # normalised name -> paths
+        self.by_stem = defaultdict(set)  # normalised stem -> paths
+        self.grams = defaultdict(set)    # trigram -> normalised names
+        self.sorted_names = []
+        self._dirty = False
+
+    def __len__(self):
+        return sum(len(files) for files in self.dir_files.values())
+
+    # === Building ===
+
+    def _add(self, directory, name):
+        path = os.path.join(directory, name)
+        key = _norm(name)
+        if not self.by_name[key]:
+            self._dirty = True
+            for g in _trigrams(key):
+                self.grams[g].add(key)
+        self.by_name[key].add(path)
+        self.by_stem[_stem(name)].add(path)
+
+    def _remove(self, directory, name):
+        path = os.path.join(directory, name)
+        key = _norm(name)
+        self.by_name[key].discard(path)
+        self.by_stem[_stem(name)].discard(path)
+        if not self.by_name[key]:
+            del self.by_name[key]
+            self._dirty = True
+            for g in _trigrams(key):
+                self.grams[g].discard(key)
+
+    def _scan_dir(self, directory, mtime):
+        files, subdirs = set(), []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            files.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+
+        old = self.dir_files.get(directory, set())
+        for name in old - files:
+            self._remove(directory, name)
+        for name in files - old:
+            self._add(directory, name)
+        self.dir_files[directory] = files
+        self.dir_mtimes[directory] = mtime
+        self.dir_children[directory] = subdirs
+        return subdirs
+
+    def refresh(self):
+        """Rescan only directories that are new or whose mtime changed."""
+        with self.lock:
+            seen = set()
+            stack = list(self.roots)
+            while stack:
+                directory = stack.pop()
+                seen.add(directory)
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                if self.dir_mtimes.get(directory) == mtime:
+                    # Unchanged listing; still descend into known subdirectories
+                    stack.extend(self.dir_children.get(directory, ()))
+                    continue
+                stack.extend(self._scan_dir(directory, mtime))
+
+            for directory in [d for d in self.dir_files if d not in seen]:
+                for name in self.dir_files.pop(directory):
+                    self._remove(directory, name)
+                self.dir_mtimes.pop(directory, None)
+                self.dir_children.pop(directory, None)
+
+            if self._dirty:
+                self.sorted_names = sorted(self.by_name)
+                self._dirty = False
+
+    # === Lookup ===
+
+    def resolve(self, query, limit=5):
+        """
+        Return (candidate paths best first, exact) for a spoken or typed file
+        name. `exact` is True only for an existing path or a match on the whole
+        (normalised) name; stem, prefix and trigram matches are guesses that a
+        caller should confirm before acting on them.
+        """
+        if os.path.isfile(query):
+            return [os.path.abspath(query)], True
+        key = _norm(os.path.basename(query))
+        if not key:
+            return [], False
+        with self.lock:
+            if key in self.by_name:
+                return sorted(self.by_name[key])[:limit], True
+            # A stem match would turn "report.docx" into report.pdf, so only
+            # use it when the query names no extension
+            stem = _stem(key)
+            if not os.path.splitext(key)[1] and self.by_stem.get(stem):
+                return sorted(self.by_stem[stem])[:limit], False
+
+            i = bisect.bisect_left(self.sorted_names, key)
+            prefixed = []
+            while i < len(self.sorted_names) and self.sorted_names[i].startswith(key) and len(prefixed) < limit:
+                prefixed.extend(sorted(self.by_name[self.sorted_names[i]]))
+                i += 1
+            if prefixed:
+                return prefixed[:limit], False
+
+            # Trigram overlap, rarest trigrams first. A match needs half the
+            # query's trigrams, so it must contain one of the rarest
+            # len - need + 1: only those posting lists are walked to find
+            # candidates (up to TRIGRAM_SCAN_LIMIT entries), and every other
+            # trigram is just a membership check on the candidates found.
+            query_grams = _trigrams(key)
+            need = (len(query_grams) + 1) // 2
+            postings = sorted((self.grams.get(g, ()) for g in query_grams), key=len)
+            seeds = len(postings) - need + 1
+            scores = defaultdict(int)
+            walked = 0
+            for i, posting in enumerate(postings):
+                if i < seeds and (i == 0 or walked + len(posting) <= TRIGRAM_SCAN_LIMIT):
+                    walked += len(posting)
+                    for name in posting:
+                        scores[name] += 1
+                elif posting:
+                    for name in scores.keys() & posting:
+                        scores[name] += 1
+            ranked = sorted(
+                (name for name, hits in scores.items() if hits >= need),
+                key=lambda n: (-scores[n], len(n)),
+            )
+            return [p for name in ranked[:limit] for p in sorted(self.by_name[name])][:limit], False
+
+
+# === Moving ===
+
+class MoveJob:
+    """A background cross-device move. `progress` is 0.0-1.0."""
+
+    def __init__(self, src, dest):
+        self.src = src
+        self.dest = dest
+        self.total = os.path.getsize(src)
+        self.copied = 0
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def progress(self):
+        return 1.0 if self.total == 0 else self.copied / self.total
+
+    def run(self, on_progress=None, on_done=None):
+        tmp = self.dest + ".part"
+        try:
+            with open(self.src, "rb") as fin, open(tmp, "wb") as fout:
+                while True:
+                    chunk = fin.read(COPY_CHUNK)
+                    if not chunk:
+                        break
+                    fout.write(chunk)
+                    self.copied += len(chunk)
+                    if on_progress:
+                        on_progress(self)
+            shutil.copystat(self.src, tmp)
+            os.replace(tmp, self.dest)
+            os.remove(self.src)
+        except OSError as e:
+            self.error = e
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        finally:
+            self.done.set()
+            if on_done:
+                on_done(self)
+
+
+def _same_device(src, dest_dir):
+    try:
+        return os.stat(src).st_dev == os.stat(dest_dir).st_dev
+    except OSError:
+        return False
+
+
+def move_files(sources, dest_dir, on_progress=None, on_done=None):
+    """
+    Move files into `dest_dir`. Same-filesystem moves are a single atomic
+    rename; cross-device moves are copied in a background thread.
+    Returns (moved paths, background MoveJobs, {src: error}).
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    moved, jobs, failed = [], [], {}
+    for src in sources:
+        dest = os.path.join(dest_dir, os.path.basename(src))
+        if os.path.exists(dest):
+            failed[src] = FileExistsError(dest)
+            continue
+        if _same_device(src, dest_dir):
+            try:
+                os.rename(src, dest)
+                moved.append(dest)
+            except OSError as e:
+                failed[src] = e
+            continue
+        job = MoveJob(src, dest)
+        threading.Thread(target=job.run, args=(on_progress, on_done), daemon=True).start()
+        jobs.append(job)
+    return moved, jobs, failed
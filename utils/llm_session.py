@@ -0,0 +1,113 @@
+# utils/llm_session.py
+
+import json
+import os
+import threading
+import requests
+
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+DEFAULT_MODEL = "qwen2.5:1.5b-instruct"
+DEFAULT_SYSTEM = (
+    "You are Ethos, a concise and polite personal butler. "
+    "Answer briefly and address the user as sir."
+)
+KEEP_ALIVE = "30m"        # keep the model (and its KV cache) resident between turns
+TOKEN_BUDGET = 3072       # reset the conversation before a turn would grow it past this
+PROMPT_HEADROOM = 512     # extra window for the system prompt and template tokens
+MAX_PREDICT = 512         # largest num_predict a caller may ask for
+
+
+class OllamaSession:
+    """
+    A multi-turn conversation with Ollama's /api/generate.
+
+    The `context` array returned at the end of each response is the model's
+    encoded conversation so far. Passing it back on the next turn means Ollama
+    only has to evaluate the new user message instead of re-encoding the whole
+    history. The system prompt is pinned for the life of the session.
+    """
+
+    def __init__(self, model=DEFAULT_MODEL, system=DEFAULT_SYSTEM,
+                 keep_alive=KEEP_ALIVE, token_budget=TOKEN_BUDGET, url=OLLAMA_URL):
+        self.model = model
+        self.system = system
+        self.keep_alive = keep_alive
+        self.token_budget = token_budget
+        # One window per session: Ollama reloads the model (dropping its KV cache)
+        # whenever num_ctx changes, so it must not follow each call's max_tokens
+        self.num_ctx = token_budget + MAX_PREDICT + PROMPT_HEADROOM
+        self.url = url.rstrip("/") + "/api/generate"
+        self.context = []
+        self.turns = 0
+        self.last_stats = {}
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.context = []
+            self.turns = 0
+
+    def _payload(self, prompt, max_tokens, temperature):
+        data = {
+            "model": self.model,
+            "prompt": prompt.strip(),
+            "keep_alive": self.keep_alive,
+            "stream": True,
+            "options": {
+                "num_predict": min(max_tokens, MAX_PREDICT),
+                "temperature": temperature,
+                # Ollama's default window can be smaller than our budget and would
+                # silently truncate the carried context
+                "num_ctx": self.num_ctx,
+            },
+        }
+        if self.system:
+            data["system"] = self.system
+        if self.context:
+            data["context"] = self.context
+        return data
+
+    def stream(self, prompt, max_tokens=200, temperature=1.0):
+        """Yield response tokens as they arrive and update the session context."""
+        with self.lock:
+            # Rough token estimate for the new message (~3 chars per token)
+            upcoming = len(prompt) // 3 + 1 + min(max_tokens, MAX_PREDICT)
+            if len(self.context) + upcoming > self.token_budget:
+                self.context = []
+                self.turns = 0
+            data = self._payload(prompt, max_tokens, temperature)
+
+        final = None
+        with requests.post(self.url, json=data, stream=True, timeout=(5, 120)) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+                if chunk.get("done"):
+                    final = chunk
+                    break
+
+        if final is not None:
+            with self.lock:
+                self.context = final.get("context") or []
+                self.turns += 1
+                self.last_stats = {
+                    "prompt_eval_count": final.get("prompt_eval_count", 0),
+                    "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+                    "eval_count": final.get("eval_count", 0),
+                    "context_tokens": len(self.context),
+                }
+
+    def ask(self, prompt, max_tokens=200, temperature=1.0) -> str:
+        return "".join(self.stream(prompt, max_tokens=max_tokens, temperature=temperature))
+
+    def unload(self):
+        """Ask Ollama to drop the model from memory right away."""
+        try:
+            requests.post(self.url, json={"model": self.model, "keep_alive": 0}, timeout=5)
+        except requests.RequestException:
+            pass
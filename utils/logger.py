@@ -1,19 +1,172 @@
-
 # utils/logger.py
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
 from rich.logging import RichHandler
 
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+LOG_FILE = os.path.join(LOG_DIR, "ethos.jsonl")
+# Per-logger levels; ETHOS_LOG_LEVELS="ethos=INFO,ethos.server=DEBUG" overrides
+LOG_LEVELS = {
+    "": logging.WARNING,
+    "ethos": logging.DEBUG,
+    "urllib3": logging.WARNING,
+    "asyncio": logging.WARNING,
+}
+DEBUG_SAMPLE_EVERY = 10   # keep 1 in N repeats of the same DEBUG call site
+
+_listener = None
+
+
+class JsonlFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records with only the message resolved. The stock prepare() formats
+    on the calling thread and strips exc_info, which leaves the listener's
+    handlers with a flattened string instead of a rich traceback or JSONL `exc`.
+    Records stay in-process, so exc_info can travel through the queue.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class DebugSampler(logging.Filter):
+    """
+    Pass the first DEBUG record from each call site, then one in every
+    `every`. Runs before the record is queued, so dropped records are never
+    formatted.
+    """
+
+    def __init__(self, every=DEBUG_SAMPLE_EVERY):
+        super().__init__()
+        self.every = every
+        self.counts = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.every <= 1:
+            return True
+        key = (record.pathname, record.lineno)
+        n = self.counts.get(key, 0)
+        self.counts[key] = n + 1
+        return n % self.every == 0
+
+
+def _levels():
+    levels = dict(LOG_LEVELS)
+    for item in filter(None, os.environ.get("ETHOS_LOG_LEVELS", "").split(",")):
+        name, _, level = item.partition("=")
+        levels["" if name.strip() == "root" else name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(console=None, jsonl_path=LOG_FILE, sample_every=DEBUG_SAMPLE_EVERY):
+    """
+    Route all logging through a QueueHandler so callers only pay for an enqueue.
+    A background QueueListener renders the Rich console output and writes the
+    JSONL sink. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    # No markup: messages carry user text such as "[tag: work]" or a stray "[/x]"
+    pretty = RichHandler(console=console, rich_tracebacks=True, markup=False)
+    pretty.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    handlers = [pretty]
+    if jsonl_path:
+        os.makedirs(os.path.dirname(jsonl_path), exist_ok=True)
+        sink = logging.handlers.RotatingFileHandler(
+            jsonl_path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+        sink.setFormatter(JsonlFormatter())
+        handlers.append(sink)
+
+    q = queue.SimpleQueue()
+    queued = DeferredQueueHandler(q)
+    queued.addFilter(DebugSampler(sample_every))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queued]
+    for name, level in _levels().items():
+        logging.getLogger(name or None).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
 def get_logger(name="ethos"):
-    logger = logging.getLogger(name)
+    setup_logging()
+    return logging.getLogger(name)
+
+
+def bench(n=5000):
+    """
+    Compare per-call cost of a synchronous RichHandler against the queued setup,
+    first without sampling and then with it. Every call here comes from one call
+    site, so the sampled run drops all but 1 in DEBUG_SAMPLE_EVERY records before
+    the queue; that line shows what sampling saves, not the queue itself.
+    """
+    from rich.console import Console
+
+    devnull = Console(file=open(os.devnull, "w"))
+    results = {}
+
+    sync = logging.getLogger("ethos.bench.sync")
+    sync.propagate = False
+    sync.setLevel(logging.DEBUG)
+    sync.addHandler(RichHandler(console=devnull, markup=False))
+    start = time.perf_counter()
+    for i in range(n):
+        sync.debug("NLU: %s", {"intent": "unknown", "task": "hello", "i": i})
+    results["sync RichHandler"] = time.perf_counter() - start
 
-    if not logger.hasHandlers():  # Prevent duplicate handlers
-        logger.setLevel(logging.DEBUG)
+    setup_logging(console=devnull, jsonl_path=os.path.join(LOG_DIR, "bench.jsonl"), sample_every=1)
+    queued = logging.getLogger("ethos.bench.queued")
+    queued.setLevel(logging.DEBUG)
+    for label, every in (("queued", 1), (f"queued + 1/{DEBUG_SAMPLE_EVERY} sampling", DEBUG_SAMPLE_EVERY)):
+        for handler in logging.getLogger().handlers:
+            handler.filters[:] = [DebugSampler(every)]
+        start = time.perf_counter()
+        for i in range(n):
+            queued.debug("NLU: %s", {"intent": "unknown", "task": "hello", "i": i})
+        results[label] = time.perf_counter() - start
 
-        handler = RichHandler(rich_tracebacks=True, markup=True)
-        formatter = logging.Formatter("%(message)s")
-        handler.setFormatter(formatter)
+    for label, elapsed in results.items():
+        print(f"{label:>28}: {elapsed / n * 1e6:8.1f} µs/call")
 
-        logger.addHandler(handler)
 
-    return logger
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench()
+    else:
+        print("Usage: python3 -m utils.logger --bench")
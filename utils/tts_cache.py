@@ -0,0 +1,137 @@
+# utils/tts_cache.py
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+# ✅ Config
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "tts")
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+PIPER_MODEL = os.environ.get("ETHOS_PIPER_MODEL", "models/en_US-amy-low.onnx")
+SYNTH_PARAMS = {"length_scale": 1.0, "noise_scale": 0.667, "noise_w": 0.8}
+PLAYER = ["aplay", "-q"]
+
+# Fixed phrases spoken by main.py and memory/agenda.py
+FIXED_PHRASES = [
+    "Goodbye.",
+    "Here is your agenda.",
+    "You have no reminders.",
+    "Here’s what I can help you with.",
+    "❌ Usage: delete reminder <number>",
+    "❌ Invalid reminder number.",
+    "❌ Still could not extract a valid time.",
+    "❌ Weather is unavailable right now.",
+    "Good morning! Here is your agenda for today.",
+    "Here are the top news headlines.",
+    "Here is your Bible verse of the day.",
+    "You have no scheduled reminders for today.",
+]
+
+
+def cache_key(text, model=PIPER_MODEL, params=None):
+    payload = json.dumps(
+        {"text": text.strip(), "model": os.path.basename(model), "params": params or SYNTH_PARAMS},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_path(text, model=PIPER_MODEL, params=None):
+    return os.path.join(CACHE_DIR, cache_key(text, model, params) + ".wav")
+
+
+def lookup(text, model=PIPER_MODEL, params=None):
+    """Return the cached WAV for `text`, or None. A hit refreshes its LRU position."""
+    path = cache_path(text, model, params)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """Drop least recently used entries until the cache fits in `max_bytes`."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for e in it:
+            if e.name.endswith(".wav"):
+                st = e.stat()
+                entries.append((st.st_mtime, st.st_size, e.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def render(text, model=PIPER_MODEL, params=None):
+    """Synthesise `text` with Piper into the cache and return the WAV path."""
+    params = params or SYNTH_PARAMS
+    path = cache_path(text, model, params)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    cmd = ["piper", "--model", model, "--output_file", tmp]
+    for name, value in params.items():
+        cmd += [f"--{name}", str(value)]
+    subprocess.run(cmd, input=text.strip().encode("utf-8"), check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.replace(tmp, path)
+    evict()
+    return path
+
+
+def play_cached(text) -> bool:
+    """Play `text` straight from the cache. Returns False on a miss or playback failure."""
+    path = lookup(text)
+    if not path:
+        return False
+    try:
+        result = subprocess.run(PLAYER + [path], stderr=subprocess.DEVNULL)
+    except OSError:
+        return False  # player missing; caller falls back to say.py
+    return result.returncode == 0
+
+
+def speak_cached(text) -> bool:
+    """
+    Play `text` through the cache, rendering it with Piper on a miss, so every
+    phrase is spoken with the same model and parameters and repeats are free.
+    Returns False if it couldn't be synthesised or played.
+    """
+    if play_cached(text):
+        return True
+    try:
+        render(text)
+    except (OSError, subprocess.CalledProcessError):
+        return False  # piper missing or failed; caller falls back to say.py
+    return play_cached(text)
+
+
+def warm_up(phrases=FIXED_PHRASES):
+    for phrase in phrases:
+        try:
+            render(phrase)
+            print(f"✅ {phrase}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ {phrase}: {e}")
+
+
+if __name__ == "__main__":
+    if "--warm" in sys.argv:
+        warm_up()
+    elif "--clear" in sys.argv:
+        evict(max_bytes=0)
+    else:
+        print("Usage: python3 -m utils.tts_cache [--warm | --clear]")
@@ -0,0 +1,227 @@
+# utils/voice.py
+
+import json
+import sys
+import time
+import wave
+import numpy as np
+
+# ✅ Config
+VOSK_MODEL = "models/vosk-model"
+RATE = 16000
+FRAME_MS = 30
+FRAME_SAMPLES = RATE * FRAME_MS // 1000
+PRE_ROLL_MS = 300       # audio kept from before the onset so words aren't clipped
+HANGOVER_MS = 600       # silence tolerated inside an utterance before it ends
+MAX_SEGMENT_MS = 15000  # a segment is cut off after this long even if "speech" continues
+ONSET_FRAMES = 3        # consecutive speech frames needed to open a segment
+SPEECH_DB = 9.0         # frame energy above the noise floor that counts as speech
+MAX_ZCR = 0.35          # crossings per sample above this are treated as hiss
+LONG_RUN_MS = 2000      # after this much unbroken "speech" the floor starts creeping up
+
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent frames, allocated once."""
+
+    def __init__(self, n_frames, frame_samples=FRAME_SAMPLES):
+        self.frames = np.zeros((n_frames, frame_samples), dtype=np.int16)
+        self.n = n_frames
+        self.start = 0
+        self.count = 0
+
+    def push(self, frame):
+        idx = (self.start + self.count) % self.n
+        self.frames[idx, :len(frame)] = frame
+        if self.count < self.n:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.n
+
+    def drain(self):
+        """Return buffered frames oldest-first as bytes and empty the buffer."""
+        order = (self.start + np.arange(self.count)) % self.n
+        data = self.frames[order].tobytes()
+        self.start = self.count = 0
+        return data
+
+
+class EnergyVAD:
+    """
+    Frame classifier using log energy against an adaptive noise floor, with a
+    zero-crossing-rate check to reject broadband noise. Real speech has gaps,
+    so an unbroken run of "speech" longer than LONG_RUN_MS is taken as a
+    louder background (fan, traffic) and the floor slowly rises to meet it.
+    """
+
+    def __init__(self, speech_db=SPEECH_DB, max_zcr=MAX_ZCR):
+        self.speech_db = speech_db
+        self.max_zcr = max_zcr
+        self.noise_db = None
+        self.run = 0
+        self.long_run = LONG_RUN_MS // FRAME_MS
+
+    def is_speech(self, frame):
+        samples = frame.astype(np.float32)
+        energy_db = 10 * np.log10(np.dot(samples, samples) / len(samples) + 1e-6)
+        if self.noise_db is None:
+            self.noise_db = energy_db
+        signs = np.signbit(frame)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / len(frame)
+
+        speech = energy_db > self.noise_db + self.speech_db and zcr < self.max_zcr
+        self.run = self.run + 1 if speech else 0
+        if not speech:
+            # Track the floor quickly downwards, slowly upwards
+            rate = 0.2 if energy_db < self.noise_db else 0.02
+            self.noise_db += rate * (energy_db - self.noise_db)
+        elif self.run > self.long_run:
+            self.noise_db += 0.01 * (energy_db - self.noise_db)
+        return speech
+
+
+class VoiceGate:
+    """
+    Turns a stream of fixed-size frames into speech segments. Only audio that
+    should reach the recognizer is returned from feed(); silence is dropped.
+    """
+
+    def __init__(self, vad=None):
+        self.vad = vad or EnergyVAD()
+        self.pre_roll = RingBuffer(max(1, PRE_ROLL_MS // FRAME_MS))
+        self.hangover = HANGOVER_MS // FRAME_MS
+        self.max_frames = MAX_SEGMENT_MS // FRAME_MS
+        self.in_speech = False
+        self.onset = 0
+        self.silence = 0
+        self.length = 0
+
+    def feed(self, data: bytes):
+        """Returns (audio for the decoder, segment_ended)."""
+        frame = np.frombuffer(data, dtype=np.int16)
+        speech = self.vad.is_speech(frame)
+
+        if not self.in_speech:
+            self.pre_roll.push(frame)
+            self.onset = self.onset + 1 if speech else 0
+            if self.onset >= ONSET_FRAMES:
+                self.in_speech = True
+                self.silence = 0
+                self.length = 0
+                return self.pre_roll.drain(), False
+            return b"", False
+
+        self.silence = 0 if speech else self.silence + 1
+        self.length += 1
+        if self.silence > self.hangover or self.length >= self.max_frames:
+            self.in_speech = False
+            self.onset = 0
+            return data, True
+        return data, False
+
+
+def _frames(read_samples):
+    """Yield whole 16-bit frames from a reader that takes a sample count."""
+    while True:
+        data = read_samples(FRAME_SAMPLES)
+        if len(data) < FRAME_SAMPLES * 2:
+            return
+        yield data
+
+
+class VoiceListener:
+    """Microphone -> VoiceGate -> Vosk, with the model loaded once."""
+
+    def __init__(self, model_path=VOSK_MODEL):
+        import pyaudio
+        from vosk import Model
+
+        self.model = Model(model_path)
+        # One VAD for the listener's lifetime: a fresh one would seed its noise
+        # floor from the first frame, and right after a spoken reply the user is
+        # often already talking, which would put the floor at speech level
+        self.vad = EnergyVAD()
+        self.audio = pyaudio.PyAudio()
+        # Opened stopped; listen() only captures while it is waiting for speech
+        self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=RATE,
+                                      input=True, frames_per_buffer=FRAME_SAMPLES, start=False)
+
+    def listen(self) -> str:
+        """Block until one utterance has been heard and return its text."""
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, RATE)
+        self.vad.run = 0
+        gate = VoiceGate(self.vad)
+        read = lambda n: self.stream.read(n, exception_on_overflow=False)
+        # Between calls the butler is thinking or speaking; a running stream would
+        # overflow and hand the next call stale audio (including our own TTS)
+        self.stream.start_stream()
+        try:
+            for data in _frames(read):
+                audio, ended = gate.feed(data)
+                if audio:
+                    recognizer.AcceptWaveform(audio)
+                if ended:
+                    text = json.loads(recognizer.FinalResult()).get("text", "")
+                    if text:
+                        return text
+                    recognizer = KaldiRecognizer(self.model, RATE)
+        finally:
+            self.stream.stop_stream()
+        return ""
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
+
+
+def bench(paths, model_path=VOSK_MODEL):
+    """Replay 16 kHz mono WAV files through Vosk with and without gating."""
+    try:
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+        SetLogLevel(-1)
+        model = Model(model_path)
+    except Exception as e:
+        print(f"⚠️ Vosk unavailable ({e}); reporting gating ratio only.")
+        model = None
+
+    for path in paths:
+        with wave.open(path, "rb") as wf:
+            if wf.getframerate() != RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"❌ {path}: expected 16 kHz mono 16-bit PCM")
+                continue
+            frames = list(_frames(wf.readframes))
+
+        results = {}
+        for gated in (False, True):
+            gate = VoiceGate()
+            recognizer = KaldiRecognizer(model, RATE) if model else None
+            fed = 0
+            texts = []
+            start = time.process_time()
+            for data in frames:
+                audio, ended = gate.feed(data) if gated else (data, False)
+                if audio:
+                    fed += len(audio)
+                    if recognizer:
+                        recognizer.AcceptWaveform(audio)
+                if ended and recognizer:
+                    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+            if recognizer:
+                texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+            results[gated] = (time.process_time() - start, fed, " ".join(t for t in texts if t))
+
+        total = len(frames) * FRAME_SAMPLES * 2
+        (cpu_all, _, text_all), (cpu_gated, fed, text_gated) = results[False], results[True]
+        print(f"📼 {path}: {len(frames) * FRAME_MS / 1000:.1f}s audio")
+        print(f"   ungated: {cpu_all:.2f}s CPU  | {text_all!r}")
+        print(f"   gated:   {cpu_gated:.2f}s CPU  | {text_gated!r}")
+        print(f"   decoded {fed / total:.0%} of audio, CPU x{cpu_all / max(cpu_gated, 1e-6):.1f} lower")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(sys.argv[2:])
+    else:
+        print("Usage: python3 -m utils.voice --bench file.wav [file.wav ...]")